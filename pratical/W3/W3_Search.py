@@ -6,6 +6,9 @@ then create problem instances and solve them with calls to the various search
 functions.
 """
 
+import math
+import mmap
+import os
 import sys
 from collections import deque
 
@@ -61,6 +64,13 @@ class Problem:
         and related algorithms try to maximize this value."""
         raise NotImplementedError
 
+    def h(self, node):
+        """The default heuristic used by the informed searches when none is
+        passed: an estimate of the cost from node to a goal. Subclasses that
+        know their domain should override it; 0 is admissible for any
+        problem but gives no guidance."""
+        return 0
+
 
 # ______________________________________________________________________________
 
@@ -73,7 +83,13 @@ class Node:
     the total path_cost (also known as g) to reach the node. Other functions
     may add an f and h value; see best_first_graph_search and astar_search for
     an explanation of how the f and h values are handled. You will not need to
-    subclass this class."""
+    subclass this class.
+
+    Nodes are created by the million in puzzle searches, so the class uses
+    __slots__: no per-instance __dict__, and f and h have slots of their own
+    for memoize to fill in."""
+
+    __slots__ = ('state', 'parent', 'action', 'path_cost', 'depth', 'f', 'h')
 
     def __init__(self, state, parent=None, action=None, path_cost=0):
         """Create a search tree Node, derived from a parent by an action."""
@@ -93,8 +109,16 @@ class Node:
 
     def expand(self, problem):
         """List the nodes reachable in one step from this node."""
-        return [self.child_node(problem, action)
-                for action in problem.actions(self.state)]
+        return list(self.iter_expand(problem))
+
+    def iter_expand(self, problem):
+        """Yield the nodes reachable in one step from this node, one at a
+        time, so a search that stops at the first goal child never builds
+        the others."""
+        state = self.state
+        for action in problem.actions(state):
+            next_state = problem.result(state, action)
+            yield Node(next_state, self, action, problem.path_cost(self.path_cost, state, action, next_state))
 
     def child_node(self, problem, action):
         """[Figure 3.10]"""
@@ -141,15 +165,21 @@ def breadth_first_tree_search(problem):
     Search through the successors of a problem to find a goal.
     The argument frontier should be an empty queue.
     Repeats infinitely in case of loops.
+    Children are goal-tested as they are generated: the first goal found
+    that way is still a shallowest one, and its siblings are never built.
     """
 
-    frontier = deque([Node(problem.initial)])  # FIFO queue
+    node = Node(problem.initial)
+    if problem.goal_test(node.state):
+        return node
+    frontier = deque([node])  # FIFO queue
 
     while frontier:
         node = frontier.popleft()
-        if problem.goal_test(node.state):
-            return node
-        frontier.extend(node.expand(problem))
+        for child in node.iter_expand(problem):
+            if problem.goal_test(child.state):
+                return child
+            frontier.append(child)
     return None
 
 
@@ -168,7 +198,7 @@ def depth_first_tree_search(problem):
         node = frontier.pop()
         if problem.goal_test(node.state):
             return node
-        frontier.extend(node.expand(problem))
+        frontier.extend(node.iter_expand(problem))
     return None
 
 
@@ -180,17 +210,23 @@ def depth_first_graph_search(problem):
     The argument frontier should be an empty queue.
     Does not get trapped by loops.
     If two paths reach a state, only use the first one.
+    The states on the frontier are also kept in a set, so checking a child
+    against the frontier is a hash lookup rather than a scan of the stack.
     """
     frontier = [(Node(problem.initial))]  # Stack
+    frontier_states = {problem.initial}
 
     explored = set()
     while frontier:
         node = frontier.pop()
+        frontier_states.discard(node.state)
         if problem.goal_test(node.state):
             return node
         explored.add(node.state)
-        frontier.extend(child for child in node.expand(problem)
-                        if child.state not in explored and child not in frontier)
+        for child in node.iter_expand(problem):
+            if child.state not in explored and child.state not in frontier_states:
+                frontier.append(child)
+                frontier_states.add(child.state)
     return None
 
 
@@ -199,20 +235,25 @@ def breadth_first_graph_search(problem):
     Note that this function can be implemented in a
     single line as below:
     return graph_search(problem, FIFOQueue())
+    As in depth_first_graph_search, frontier_states mirrors the states on
+    the frontier so the duplicate check does not scan the queue.
     """
     node = Node(problem.initial)
     if problem.goal_test(node.state):
         return node
     frontier = deque([node])
+    frontier_states = {node.state}
     explored = set()
     while frontier:
         node = frontier.popleft()
+        frontier_states.discard(node.state)
         explored.add(node.state)
-        for child in node.expand(problem):
-            if child.state not in explored and child not in frontier:
+        for child in node.iter_expand(problem):
+            if child.state not in explored and child.state not in frontier_states:
                 if problem.goal_test(child.state):
                     return child
                 frontier.append(child)
+                frontier_states.add(child.state)
     return None
 
 
@@ -227,7 +268,7 @@ def depth_limited_search(problem, limit=50):
             return 'cutoff'
         else:
             cutoff_occurred = False
-            for child in node.expand(problem):
+            for child in node.iter_expand(problem):
                 result = recursive_dls(child, problem, limit - 1)
                 if result == 'cutoff':
                     cutoff_occurred = True
@@ -267,13 +308,12 @@ def best_first_graph_search(problem, f, display=False):
                 print(len(explored), "paths have been expanded and", len(frontier), "paths remain in the frontier")
             return node
         explored.add(node.state)
-        for child in node.expand(problem):
+        for child in node.iter_expand(problem):
             if child.state not in explored and child not in frontier:
                 frontier.append(child)
             elif child in frontier:
                 if f(child) < frontier[child]:
-                    del frontier[child]
-                    frontier.append(child)
+                    frontier.append(child)  # replaces the queued node
     return None
 
 
@@ -282,14 +322,113 @@ def uniform_cost_search(problem, display=False):
     return best_first_graph_search(problem, lambda node: node.path_cost, display)
 
 
-class EightPuzzle(Problem):
-    """ The problem of sliding tiles numbered from 1 to 8 on a 3x3 board, where one of the
-    squares is a blank. A state is represented as a tuple of length 9, where  element at
-    index i represents the tile number  at index i (0 if it's an empty square) """
+# ______________________________________________________________________________
+# Informed (Heuristic) Search
+# Each search takes a heuristic h(node), defaulting to problem.h, and memoizes
+# it in the node's h slot so it is computed at most once per node.
 
-    def __init__(self, initial, goal=(1, 2, 3, 4, 5, 6, 7, 8, 0)):
+
+def greedy_best_first_graph_search(problem, h=None, display=False):
+    """Search the nodes that look closest to a goal first, i.e. with f(n) = h(n).
+    Fast, but the solution found need not be the cheapest."""
+    h = memoize(h or problem.h, 'h')
+    return best_first_graph_search(problem, h, display)
+
+
+def astar_search(problem, h=None, display=False):
+    """A* search is best-first graph search with f(n) = g(n)+h(n).
+    The solution is optimal if h never overestimates and is consistent,
+    as the straight-line and Manhattan distances below are."""
+    h = memoize(h or problem.h, 'h')
+    return best_first_graph_search(problem, lambda n: n.path_cost + h(n), display)
+
+
+def iterative_deepening_astar_search(problem, h=None):
+    """IDA*: depth-first search bounded by f(n) = g(n)+h(n), repeated with
+    the bound raised to the smallest f that exceeded it. Optimal for an
+    admissible h, and its memory is only the current path."""
+    h = memoize(h or problem.h, 'h')
+
+    def bounded_search(node, bound, on_path):
+        f = node.path_cost + h(node)
+        if f > bound:
+            return None, f
+        if problem.goal_test(node.state):
+            return node, f
+        smallest = np.inf
+        for child in node.iter_expand(problem):
+            if child.state in on_path:
+                continue
+            on_path.add(child.state)
+            result, exceeded = bounded_search(child, bound, on_path)
+            on_path.discard(child.state)
+            if result is not None:
+                return result, exceeded
+            smallest = min(smallest, exceeded)
+        return None, smallest
+
+    node = Node(problem.initial)
+    bound = h(node)
+    while True:
+        result, bound = bounded_search(node, bound, {node.state})
+        if result is not None or bound == np.inf:
+            return result
+
+
+def recursive_best_first_search(problem, h=None):
+    """[Figure 3.26]"""
+    h = memoize(h or problem.h, 'h')
+
+    def RBFS(problem, node, flimit):
+        if problem.goal_test(node.state):
+            return node, 0  # (The second value is immaterial)
+        successors = node.expand(problem)
+        if len(successors) == 0:
+            return None, np.inf
+        for s in successors:
+            s.f = max(s.path_cost + h(s), node.f)
+        while True:
+            # Order by lowest f value
+            successors.sort(key=lambda x: x.f)
+            best = successors[0]
+            if best.f > flimit:
+                return None, best.f
+            if len(successors) > 1:
+                alternative = successors[1].f
+            else:
+                alternative = np.inf
+            result, best.f = RBFS(problem, best, min(flimit, alternative))
+            if result is not None:
+                return result, best.f
+
+    node = Node(problem.initial)
+    node.f = h(node)
+    result, bestf = RBFS(problem, node, np.inf)
+    return result
+
+
+class SlidingPuzzle(Problem):
+    """ The N x N sliding-tile puzzle: tiles numbered 1 to N*N - 1 and one blank
+    square. A state is a tuple of length N*N, where the element at index i is
+    the tile on square i (0 for the blank), squares numbered row by row. The
+    goal defaults to the tiles in order with the blank last.
+
+    The default heuristic is the Manhattan distance. For the 15- and
+    24-puzzle, pass pattern_databases (see load_pattern_databases) and h
+    becomes the sum of their lookups, which is admissible and far stronger. """
+
+    def __init__(self, initial, goal=None, pattern_databases=None):
         """ Define goal state and initialize a problem """
+        self.side = math.isqrt(len(initial))
+        if self.side * self.side != len(initial):
+            raise ValueError("a sliding puzzle needs a square number of squares")
+        if goal is None:
+            goal = tuple(range(1, len(initial))) + (0,)
         super().__init__(initial, goal)
+        self.delta = {'UP': -self.side, 'DOWN': self.side, 'LEFT': -1, 'RIGHT': 1}
+        # (row, column) of every tile in the goal, for the Manhattan heuristic
+        self.goal_positions = {tile: divmod(i, self.side) for i, tile in enumerate(goal)}
+        self.pattern_databases = pattern_databases
 
     def find_blank_square(self, state):
         """Return the index of the blank square in a given state"""
@@ -303,14 +442,15 @@ class EightPuzzle(Problem):
 
         possible_actions = ['UP', 'DOWN', 'LEFT', 'RIGHT']
         index_blank_square = self.find_blank_square(state)
+        side = self.side
 
-        if index_blank_square % 3 == 0:
+        if index_blank_square % side == 0:
             possible_actions.remove('LEFT')
-        if index_blank_square < 3:
+        if index_blank_square < side:
             possible_actions.remove('UP')
-        if index_blank_square % 3 == 2:
+        if index_blank_square % side == side - 1:
             possible_actions.remove('RIGHT')
-        if index_blank_square > 5:
+        if index_blank_square >= len(state) - side:
             possible_actions.remove('DOWN')
 
         return possible_actions
@@ -323,8 +463,7 @@ class EightPuzzle(Problem):
         blank = self.find_blank_square(state)
         new_state = list(state)
 
-        delta = {'UP': -3, 'DOWN': 3, 'LEFT': -1, 'RIGHT': 1}
-        neighbor = blank + delta[action]
+        neighbor = blank + self.delta[action]
         new_state[blank], new_state[neighbor] = new_state[neighbor], new_state[blank]
 
         return tuple(new_state)
@@ -335,7 +474,9 @@ class EightPuzzle(Problem):
         return state == self.goal
 
     def check_solvability(self, state):
-        """ Checks if the given state is solvable """
+        """ Checks if the given state can reach the default goal. On boards
+        of even width a vertical move also flips the inversion parity, so the
+        blank's row is counted too """
 
         inversion = 0
         for i in range(len(state)):
@@ -343,8 +484,263 @@ class EightPuzzle(Problem):
                 if (state[i] > state[j]) and state[i] != 0 and state[j] != 0:
                     inversion += 1
 
-        return inversion % 2 == 0
+        if self.side % 2:
+            return inversion % 2 == 0
+        return (inversion + state.index(0) // self.side) % 2 == 1
+
+    def h(self, node):
+        """ Return the heuristic value for a given state: the sum of the
+        pattern database lookups if there are any, otherwise the Manhattan
+        distance, the sum over the tiles (not the blank) of how many rows and
+        columns each is away from its goal square """
+
+        if self.pattern_databases:
+            state = node.state
+            return sum(database.lookup(state) for database in self.pattern_databases)
+
+        distance = 0
+        for i, tile in enumerate(node.state):
+            if tile:
+                row, col = self.goal_positions[tile]
+                distance += abs(i // self.side - row) + abs(i % self.side - col)
+        return distance
+
+
+class EightPuzzle(SlidingPuzzle):
+    """ The problem of sliding tiles numbered from 1 to 8 on a 3x3 board, where one of the
+    squares is a blank. A state is represented as a tuple of length 9, where  element at
+    index i represents the tile number  at index i (0 if it's an empty square) """
+
+    def __init__(self, initial, goal=(1, 2, 3, 4, 5, 6, 7, 8, 0), pattern_databases=None):
+        """ Define goal state and initialize a problem """
+        super().__init__(initial, goal, pattern_databases)
+
+
+class PatternDatabase:
+    """ An additive pattern database for one group of tiles of a sliding
+    puzzle: for every placement of the group's tiles, the fewest moves of
+    those tiles needed to bring them to their goal squares (Korf and Felner
+    2002). The search runs over the group's tiles and the blank, the other
+    tiles being indistinct, so a group tile only moves by swapping with the
+    blank. Moves of the blank through the other tiles' squares cost nothing
+    and only the group's own moves are counted, so the lookups of disjoint
+    groups can be added and the sum never overestimates. Each entry is the
+    minimum over where the blank is.
+
+    The table is filled by a retrograde breadth-first search from the goal,
+    a whole layer at a time with NumPy: each layer is first closed under the
+    free blank moves, then the group's moves lead to the next. Placements are
+    indexed as the group's squares read as digits in base N*N, one byte per
+    entry, and save() writes the bytes after a small header. load() maps the
+    file read-only instead of reading it, so opening large databases is
+    instant and worker processes share the pages. """
+
+    MAGIC = b"PDB2"
+    UNSEEN = 255
+
+    def __init__(self, side, tiles, goal_squares, blank_square, table):
+        self.side = side
+        self.tiles = tuple(tiles)
+        self.goal_squares = tuple(goal_squares)
+        self.blank_square = blank_square
+        self.table = table
+        squares = side * side
+        weights = (squares ** (len(self.tiles) - 1 - i) for i in range(len(self.tiles)))
+        self.weighted_tiles = tuple(zip(self.tiles, weights))
+
+    def lookup(self, state):
+        """ Moves needed for the group's tiles, read straight from a state
+        tuple: one index() per tile and one byte read """
+        index = 0
+        for tile, weight in self.weighted_tiles:
+            index += state.index(tile) * weight
+        return self.table[index]
+
+    @classmethod
+    def build(cls, side, tiles, goal):
+        """ Build the database of tiles for goal by retrograde BFS """
+        squares = side * side
+        count = len(tiles)
+        # The blank is the last digit, so dropping it leaves the table index
+        weights = np.array([squares ** (count - i) for i in range(count)] + [1], dtype=np.int64)
+        goal_squares = [goal.index(tile) for tile in tiles]
+        blank_square = goal.index(0)
+        distances = np.full(squares ** (count + 1), cls.UNSEEN, dtype=np.uint8)
+
+        def blank_steps(blank):
+            return ((-side, blank >= side), (side, blank < squares - side),
+                    (-1, blank % side > 0), (1, blank % side < side - 1))
+
+        layer = np.array([int(np.dot(goal_squares + [blank_square], weights))], dtype=np.int64)
+        distances[layer] = 0
+        distance = 0
+        while layer.size:
+            # Free moves: the blank slides onto a square no group tile is on
+            reached = [layer]
+            new = layer
+            while new.size:
+                places = (new[:, None] // weights) % squares
+                blank, group = places[:, -1], places[:, :-1]
+                found = []
+                for step, legal in blank_steps(blank):
+                    legal = legal & ~(group == (blank + step)[:, None]).any(axis=1)
+                    candidates = new[legal] + step
+                    found.append(candidates[distances[candidates] == cls.UNSEEN])
+                new = np.unique(np.concatenate(found))
+                distances[new] = distance
+                reached.append(new)
+            layer = np.concatenate(reached)
+
+            # Counted moves: a group tile slides onto the blank's square
+            places = (layer[:, None] // weights) % squares
+            blank = places[:, -1]
+            found = []
+            for step, legal in blank_steps(blank):
+                moved = blank + step
+                for i in range(count):
+                    hit = legal & (places[:, i] == moved)
+                    candidates = layer[hit] + step - step * weights[i]
+                    found.append(candidates[distances[candidates] == cls.UNSEEN])
+            distance += 1
+            layer = np.unique(np.concatenate(found))
+            distances[layer] = distance
+
+        table = distances.reshape(-1, squares).min(axis=1)
+        return cls(side, tiles, goal_squares, blank_square, table.tobytes())
+
+    def save(self, filename):
+        """ Write the header (magic, side, group size, tiles, goal squares,
+        blank's goal square) and the table """
+        with open(filename, 'wb') as f:
+            f.write(self.MAGIC + bytes([self.side, len(self.tiles)]))
+            f.write(bytes(self.tiles) + bytes(self.goal_squares) + bytes([self.blank_square]))
+            f.write(self.table)
+
+    @classmethod
+    def load(cls, filename):
+        """ Map a database written by save() """
+        with open(filename, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:4] != cls.MAGIC:
+            raise ValueError("{} is not a pattern database".format(filename))
+        side, count = data[4], data[5]
+        tiles = tuple(data[6:6 + count])
+        goal_squares = tuple(data[6 + count:6 + 2 * count])
+        blank_square = data[6 + 2 * count]
+        table = memoryview(data)[7 + 2 * count:]
+        if len(table) != (side * side) ** count:
+            raise ValueError("{} is truncated or corrupt".format(filename))
+        return cls(side, tiles, goal_squares, blank_square, table)
+
+
+def default_tile_groups(side):
+    """ Disjoint groups covering every tile, sized so each build (the group
+    and the blank, N*N to the power group size + 1 bytes) stays under 20 MB:
+    4-4 for the 8-puzzle, 5-5-5 for the 15-puzzle and 4-4-4-4-4-4 for the
+    24-puzzle """
+    tiles = list(range(1, side * side))
+    size = {3: 4, 4: 5}.get(side, 4)
+    return [tiles[i:i + size] for i in range(0, len(tiles), size)]
+
+
+def load_pattern_databases(goal, groups=None, directory='.'):
+    """ Return the PatternDatabases for goal, one per group of tiles
+    (default_tile_groups by default), loading each from directory or
+    building and saving it there the first time """
+    side = math.isqrt(len(goal))
+    databases = []
+    for tiles in groups or default_tile_groups(side):
+        goal_squares = tuple(goal.index(tile) for tile in tiles)
+        filename = os.path.join(directory, "pdb-{0}x{0}-{1}-at-{2}-blank-{3}.bin".format(
+            side, "-".join(map(str, tiles)), "-".join(map(str, goal_squares)), goal.index(0)))
+        if not os.path.exists(filename):
+            os.makedirs(directory, exist_ok=True)
+            PatternDatabase.build(side, tiles, goal).save(filename)
+        databases.append(PatternDatabase.load(filename))
+    return databases
+
+
+class PackedEightPuzzle(EightPuzzle):
+    """ The 8-puzzle with each state packed into one int: 4 bits per square
+    (square i in bits 4i..4i+3) and the index of the blank above them, from
+    bit 36. States stay hashable and comparable, but applying a move is a few
+    shifts and masks driven by tables built once, with no tuple, list or
+    dict made per call.
+
+    The constructor takes and pack()/unpack() convert to the tuple states of
+    EightPuzzle, so a search is set up and its result read the same way:
+
+        problem = PackedEightPuzzle((2, 0, 3, 1, 4, 5, 7, 8, 6))
+        node = astar_search(problem)
+        node.solution(), problem.unpack(node.state)
+    """
+
+    BLANK_SHIFT = 36
 
+    # For each blank square, the legal actions in EightPuzzle's order
+    ACTIONS = tuple(
+        tuple(action for action, legal in (('UP', i >= 3), ('DOWN', i < 6),
+                                           ('LEFT', i % 3 > 0), ('RIGHT', i % 3 < 2)) if legal)
+        for i in range(9))
+
+    def __init__(self, initial, goal=(1, 2, 3, 4, 5, 6, 7, 8, 0)):
+        super().__init__(initial, goal)
+        self.initial = self.pack(initial)
+        self.goal = self.pack(goal)
+
+        # moves[blank][action] = (shift of the square the tile comes from,
+        # what to multiply the tile by to move it onto the blank's square,
+        # change to the blank index field)
+        delta = {'UP': -3, 'DOWN': 3, 'LEFT': -1, 'RIGHT': 1}
+        self.moves = []
+        for blank, actions in enumerate(self.ACTIONS):
+            self.moves.append({})
+            for action in actions:
+                target = blank + delta[action]
+                self.moves[blank][action] = (4 * target, (1 << (4 * blank)) - (1 << (4 * target)),
+                                             (target - blank) << self.BLANK_SHIFT)
+
+        # distances[square][tile]: Manhattan distance of tile on square from
+        # its goal square (0 for the blank)
+        self.distances = [[0] * 16 for _ in range(9)]
+        for tile, (row, col) in self.goal_positions.items():
+            if tile:
+                for i in range(9):
+                    self.distances[i][tile] = abs(i // 3 - row) + abs(i % 3 - col)
+
+    def pack(self, state):
+        """ Return the packed int for a tuple state """
+        packed = 0
+        for i, tile in enumerate(state):
+            packed |= tile << (4 * i)
+        return packed | (state.index(0) << self.BLANK_SHIFT)
+
+    def unpack(self, state):
+        """ Return the tuple state for a packed int """
+        return tuple((state >> (4 * i)) & 15 for i in range(9))
+
+    def find_blank_square(self, state):
+        return state >> self.BLANK_SHIFT
+
+    def actions(self, state):
+        return self.ACTIONS[state >> self.BLANK_SHIFT]
+
+    def result(self, state, action):
+        shift, factor, blank_change = self.moves[state >> self.BLANK_SHIFT][action]
+        # The blank's square holds 0, so moving the tile there is one add
+        return state + ((state >> shift) & 15) * factor + blank_change
+
+    def check_solvability(self, state):
+        return super().check_solvability(self.unpack(state))
+
+    def h(self, node):
+        """ Manhattan distance, read square by square from the packed state """
+        state = node.state
+        total = 0
+        for row in self.distances:
+            total += row[state & 15]
+            state >>= 4
+        return total
 
 
 # ______________________________________________________________________________
@@ -368,6 +764,7 @@ class Graph:
     def __init__(self, graph_dict=None, directed=True):
         self.graph_dict = graph_dict or {}
         self.directed = directed
+        self.reverse_dict = None
         if not directed:
             self.make_undirected()
 
@@ -387,6 +784,8 @@ class Graph:
     def connect1(self, A, B, distance):
         """Add a link from A to B of given distance, in one direction only."""
         self.graph_dict.setdefault(A, {})[B] = distance
+        if self.reverse_dict is not None:
+            self.reverse_dict.setdefault(B, {})[A] = distance
 
     def get(self, a, b=None):
         """Return a link distance or a dict of {node: distance} entries.
@@ -398,6 +797,19 @@ class Graph:
         else:
             return links.get(b)
 
+    def incoming(self, b):
+        """Return a dict of {node: distance} entries for the links into b.
+        For an undirected graph that is just .get(b); a directed graph builds
+        a reverse-adjacency index on first use and keeps it up to date."""
+        if not self.directed:
+            return self.get(b)
+        if self.reverse_dict is None:
+            self.reverse_dict = {}
+            for a, links in self.graph_dict.items():
+                for node, dist in links.items():
+                    self.reverse_dict.setdefault(node, {})[a] = dist
+        return self.reverse_dict.get(b, {})
+
     def nodes(self):
         """Return a list of nodes in the graph."""
         s1 = set([k for k in self.graph_dict.keys()])
@@ -456,6 +868,15 @@ class GraphProblem(Problem):
     def path_cost(self, cost_so_far, A, action, B):
         return cost_so_far + (self.graph.get(A, B) or np.inf)
 
+    def h(self, node):
+        """h function is straight-line distance from a node's state to goal,
+        or 0 if the graph has no locations to measure it with."""
+        locs = getattr(self.graph, 'locations', None)
+        if locs:
+            return int(distance(locs[node.state], locs[self.goal]))
+        else:
+            return 0
+
     def find_min_edge(self):
         """Find minimum value of edges."""
         m = np.inf
@@ -466,6 +887,102 @@ class GraphProblem(Problem):
         return m
 
 
+# ______________________________________________________________________________
+# Bidirectional Search
+
+
+def bidirectional_uniform_cost_search(problem, display=False):
+    """Uniform-cost search from problem.initial and, over the reversed links
+    (see Graph.incoming), from problem.goal at once, for a GraphProblem with
+    a single goal. Each search only needs to reach about half the route
+    length, so far fewer nodes are expanded on large graphs."""
+    return bidirectional_search(problem, None, None, display)
+
+
+def bidirectional_astar_search(problem, h=None, h_back=None, display=False):
+    """Bidirectional search guided by heuristics: h estimates the cost from
+    a node to the goal (problem.h by default) and h_back the cost from the
+    initial state to a node (by default the h of the reversed problem).
+    Both sides order their frontiers by the average of the two,
+    (h - h_back) / 2 for the forward side and the negative for the
+    backward side, which keeps the search optimal when both are consistent
+    (Ikeda et al. 1994)."""
+    h = h or problem.h
+    h_back = h_back or GraphProblem(problem.goal, problem.initial, problem.graph).h
+    return bidirectional_search(problem, h, h_back, display)
+
+
+def bidirectional_search(problem, h=None, h_back=None, display=False):
+    """The search behind the two functions above; with no heuristic it is
+    bidirectional uniform-cost search.
+
+    The side with the smaller frontier is expanded next. Whenever a state is
+    labelled by both sides, the best route through it so far is recorded as
+    best. The search stops as soon as the two smallest frontier keys add up
+    to at least best: no route found later could be cheaper. The result is
+    an ordinary Node chain, so solution() and path() work as usual."""
+    graph = problem.graph
+    start, goal = problem.initial, problem.goal
+    if problem.goal_test(start):
+        return Node(start)
+
+    if h is None:
+        def potential(state):
+            return 0
+    else:
+        potential = memoize(lambda state: (h(Node(state)) - h_back(Node(state))) / 2, maxsize=None)
+
+    cost = ({start: 0}, {goal: 0})
+    parent = ({start: None}, {goal: None})
+    closed = (set(), set())
+    frontiers = (PriorityQueue('min', lambda state: cost[0][state] + potential(state)),
+                 PriorityQueue('min', lambda state: cost[1][state] - potential(state)))
+    links = (graph.get, graph.incoming)
+    frontiers[0].append(start)
+    frontiers[1].append(goal)
+
+    best, meet = np.inf, None
+    while frontiers[0] and frontiers[1]:
+        if frontiers[0].heap[0][0] + frontiers[1].heap[0][0] >= best:
+            break
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        other = 1 - side
+        state = frontiers[side].pop()
+        closed[side].add(state)
+        for neighbor, dist in links[side](state).items():
+            if neighbor in closed[side]:
+                continue
+            new_cost = cost[side][state] + dist
+            if new_cost < cost[side].get(neighbor, np.inf):
+                cost[side][neighbor] = new_cost
+                parent[side][neighbor] = state
+                frontiers[side].append(neighbor)
+                if neighbor in cost[other] and new_cost + cost[other][neighbor] < best:
+                    best, meet = new_cost + cost[other][neighbor], neighbor
+
+    if display:
+        print(len(closed[0]) + len(closed[1]), "paths have been expanded and",
+              len(frontiers[0]) + len(frontiers[1]), "paths remain in the frontier")
+    if meet is None:
+        return None
+
+    states = []
+    state = meet
+    while state is not None:
+        states.append(state)
+        state = parent[0][state]
+    states.reverse()
+    state = parent[1][meet]
+    while state is not None:
+        states.append(state)
+        state = parent[1][state]
+
+    node = Node(start)
+    for state in states[1:]:
+        node = Node(state, node, state, problem.path_cost(node.path_cost, node.state, state, state))
+    return node
+
+
 def run8Puzzle():
     # Let's start with an 8-Puzzle probelm
     prob1 = EightPuzzle(initial=(2, 0, 3, 1, 4, 5, 7, 8, 6), goal=(1, 2, 3, 4, 5, 6, 7, 8, 0))
@@ -4,7 +4,6 @@ import bisect
 import collections
 import collections.abc
 import functools
-import heapq
 import operator
 import os.path
 import random
@@ -724,10 +723,17 @@ class PriorityQueue:
     order) is returned first.
     If order is 'min', the item with minimum f(x) is
     returned first; if order is 'max', then it is the item with maximum f(x).
-    Also supports dict-like lookup."""
+    Also supports dict-like lookup.
+
+    The heap is indexed: self.index maps each item to its position in
+    self.heap, so `in`, lookup and deletion never scan the heap. Items must
+    be hashable, and equal items share one entry: appending an item equal to
+    one already queued replaces it and moves it to its new priority in
+    O(log n), which is how a search lowers a node's f (decrease-key)."""
 
     def __init__(self, order='min', f=lambda x: x):
         self.heap = []
+        self.index = {}
         if order == 'min':
             self.f = f
         elif order == 'max':  # now item with max f(x)
@@ -736,19 +742,44 @@ class PriorityQueue:
             raise ValueError("Order must be either 'min' or 'max'.")
 
     def append(self, item):
-        """Insert item at its correct position."""
-        heapq.heappush(self.heap, (self.f(item), item))
+        """Insert item at its correct position, or move it there if an equal
+        item is already queued."""
+        entry = (self.f(item), item)
+        pos = self.index.get(item)
+        if pos is None:
+            self.heap.append(entry)
+            self.index[item] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+        else:
+            del self.index[item]
+            self._replace(pos, entry)
 
     def extend(self, items):
-        """Insert each item in items at its correct position."""
+        """Insert each item in items at its correct position. A batch at
+        least as large as the queue is added in one O(n) heapify rather
+        than item by item."""
+        items = list(items)
+        if len(items) < len(self.heap):
+            for item in items:
+                self.append(item)
+            return
         for item in items:
-            self.append(item)
+            entry = (self.f(item), item)
+            pos = self.index.pop(item, None)
+            if pos is None:
+                self.heap.append(entry)
+                pos = len(self.heap) - 1
+            else:
+                self.heap[pos] = entry
+            self.index[item] = pos
+        for pos in reversed(range(len(self.heap) // 2)):
+            self._sift_down(pos)
 
     def pop(self):
         """Pop and return the item (with min or max f(x) value)
         depending on the order."""
         if self.heap:
-            return heapq.heappop(self.heap)[1]
+            return self._remove(0)[1]
         else:
             raise Exception('Trying to pop from empty PriorityQueue.')
 
@@ -758,23 +789,76 @@ class PriorityQueue:
 
     def __contains__(self, key):
         """Return True if the key is in PriorityQueue."""
-        return any([item == key for _, item in self.heap])
+        return key in self.index
 
     def __getitem__(self, key):
-        """Returns the first value associated with key in PriorityQueue.
+        """Returns the value associated with key in PriorityQueue.
         Raises KeyError if key is not present."""
-        for value, item in self.heap:
-            if item == key:
-                return value
-        raise KeyError(str(key) + " is not in the priority queue")
+        try:
+            return self.heap[self.index[key]][0]
+        except KeyError:
+            raise KeyError(str(key) + " is not in the priority queue")
 
     def __delitem__(self, key):
-        """Delete the first occurrence of key."""
+        """Delete key."""
         try:
-            del self.heap[[item == key for _, item in self.heap].index(True)]
-        except ValueError:
+            pos = self.index[key]
+        except KeyError:
             raise KeyError(str(key) + " is not in the priority queue")
-        heapq.heapify(self.heap)
+        self._remove(pos)
+
+    def _remove(self, pos):
+        """Take the entry at pos out of the heap and return it."""
+        heap = self.heap
+        entry = heap[pos]
+        del self.index[entry[1]]
+        last = heap.pop()
+        if pos < len(heap):
+            del self.index[last[1]]
+            self._replace(pos, last)
+        return entry
+
+    def _replace(self, pos, entry):
+        """Put entry at pos, whose item is not indexed yet, and restore the
+        heap order around it."""
+        old = self.heap[pos]
+        self.heap[pos] = entry
+        self.index[entry[1]] = pos
+        if entry < old:
+            self._sift_up(pos)
+        else:
+            self._sift_down(pos)
+
+    def _sift_up(self, pos):
+        heap, index = self.heap, self.index
+        entry = heap[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if not entry < heap[parent]:
+                break
+            heap[pos] = heap[parent]
+            index[heap[pos][1]] = pos
+            pos = parent
+        heap[pos] = entry
+        index[entry[1]] = pos
+
+    def _sift_down(self, pos):
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[pos]
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            heap[pos] = heap[child]
+            index[heap[pos][1]] = pos
+            pos = child
+        heap[pos] = entry
+        index[entry[1]] = pos
 
 
 # ______________________________________________________________________________
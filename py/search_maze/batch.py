@@ -0,0 +1,151 @@
+"""Solve many maze files in parallel and stream one JSON result line per maze.
+
+Usage: python batch.py SOURCE [SOURCE ...] [options]
+
+A SOURCE may be a directory (its .txt mazes and maze caches), a glob pattern
+or a single maze file; --list adds paths from a newline-separated file ("-" for stdin).
+Images are only rendered when --images is given.
+
+peak_rss_kb is the worker's peak resident memory while solving that maze,
+reset before each one through /proc. Where that is unavailable the record
+has worker_peak_rss_kb instead, the worker's peak over all its mazes so far.
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from multiprocessing import Pool
+
+from maze import CACHE_MAGIC, WEIGHTED_MAGIC, Maze, SolveStats, STRATEGIES, TERRAINS
+
+
+def is_maze_file(path):
+    """Whether a file found in a directory source is a maze: a .txt file or
+    a binary cache written by Maze.save()."""
+    if path.endswith(".txt"):
+        return True
+    with open(path, "rb") as f:
+        return f.read(len(CACHE_MAGIC)) in (CACHE_MAGIC, WEIGHTED_MAGIC)
+
+
+def collect(sources, list_file=None):
+    """Expand directories, glob patterns and list files into maze paths."""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(sorted(
+                path for path in glob.glob(os.path.join(source, "*"))
+                if os.path.isfile(path) and is_maze_file(path)
+            ))
+        elif glob.has_magic(source):
+            paths.extend(sorted(glob.glob(source)))
+        else:
+            paths.append(source)
+
+    if list_file is not None:
+        f = sys.stdin if list_file == "-" else open(list_file)
+        with f:
+            paths.extend(line.strip() for line in f if line.strip())
+
+    return paths
+
+
+def reset_peak_rss():
+    """Reset this process's peak resident set size to its current size, so
+    peak_rss_kb() then covers only what follows. Returns False where the
+    kernel does not support it (anything but Linux)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_kb():
+    """Peak resident set size in KiB since the last reset_peak_rss()."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+
+
+def solve_file(job):
+    """Solve one maze and return its result record. Failures are reported
+    in the record rather than raised, so one bad maze doesn't stop a batch."""
+    path, strategy, terrain, image_dir, trace_memory, with_stats = job
+    result = {"maze": path, "strategy": strategy}
+
+    per_maze_rss = reset_peak_rss()
+    if trace_memory:
+        tracemalloc.start()
+    m = None
+    stats = SolveStats() if with_stats else None
+    started = time.perf_counter()
+    try:
+        m = Maze(path, TERRAINS.get(terrain))
+        loaded = time.perf_counter()
+        m.solve(strategy, stats=stats)
+        solved = time.perf_counter()
+        result["explored"] = m.num_explored
+        result["path_length"] = len(m.solution[0])
+        if m.costs is not None:
+            result["path_cost"] = m.path_cost()
+        result["load_seconds"] = loaded - started
+        result["solve_seconds"] = solved - loaded
+        if image_dir is not None:
+            name = os.path.splitext(os.path.basename(path))[0] + ".png"
+            m.output_image(os.path.join(image_dir, name), show_explored=True)
+    except Exception as e:
+        result["error"] = str(e)
+        result["explored"] = getattr(m, "num_explored", None)
+    result["seconds"] = time.perf_counter() - started
+    if stats is not None:
+        result["stats"] = stats.as_dict()
+
+    if trace_memory:
+        result["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if per_maze_rss:
+        result["peak_rss_kb"] = peak_rss_kb()
+    else:
+        # ru_maxrss is the high-water mark of the whole worker process, so it
+        # covers every maze the worker has solved, not just this one
+        result["worker_peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve maze files in parallel.")
+    parser.add_argument("sources", nargs="*", help="maze files, directories or glob patterns")
+    parser.add_argument("--list", dest="list_file", help="file with one maze path per line, or - for stdin")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("-s", "--strategy", default="bfs", choices=STRATEGIES, help="search strategy")
+    parser.add_argument("--terrain", choices=TERRAINS,
+                        help="read text mazes as weighted, e.g. digits for step costs 1-9")
+    parser.add_argument("--images", metavar="DIR", help="also write a PNG per maze into DIR")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="report per-maze peak Python allocations (slower)")
+    parser.add_argument("--stats", action="store_true", help="include SolveStats counters and timings")
+    args = parser.parse_args()
+
+    paths = collect(args.sources, args.list_file)
+    if not paths:
+        parser.error("no maze files given")
+    if args.images is not None:
+        os.makedirs(args.images, exist_ok=True)
+
+    jobs = [(path, args.strategy, args.terrain, args.images, args.trace_memory, args.stats)
+            for path in paths]
+    with Pool(args.workers) as pool:
+        for result in pool.imap_unordered(solve_file, jobs):
+            print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
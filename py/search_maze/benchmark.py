@@ -0,0 +1,141 @@
+"""Benchmark every Maze.solve strategy across a ladder of maze sizes.
+
+Usage: python benchmark.py [--min-cells N] [--max-cells N] [--strategies S ...]
+                           [--kind KIND] [--json FILE] [--compare OLD.json]
+
+Mazes are made with generate.py, cached in the binary format next to their
+text form, and each (size, strategy) run is solved in a fresh process so
+its peak RSS is its own. Results are printed as a table and, with --json,
+written as a list of records. --compare flags runs that got slower than an
+earlier --json file by more than --tolerance and exits with status 1.
+"""
+
+import argparse
+import json
+import math
+import os
+import resource
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+import generate
+from maze import Maze, STRATEGIES
+
+LADDER = tuple(10 ** n for n in range(3, 9))
+
+# Table columns: record key, width and value format
+COLUMNS = (
+    ("cells", 11, "{:,}"),
+    ("strategy", 13, "{}"),
+    ("seconds", 10, "{:.4f}"),
+    ("explored", 11, "{:,}"),
+    ("path_length", 11, "{:,}"),
+    ("states_per_second", 17, "{:,.0f}"),
+    ("peak_rss_kb", 11, "{:,}"),
+)
+
+
+def maze_file(cells, kind, seed, directory):
+    """Return the binary cache of a square maze with about cells cells,
+    generating it first if needed."""
+    side = max(3, math.isqrt(cells))
+    path = os.path.join(directory, "{}-{}-{}.txt".format(kind, side, seed))
+    cache = path + ".bin"
+    if not os.path.exists(cache):
+        generate.write(generate.generate(side, side, kind, seed=seed), path)
+        Maze(path).save(cache)
+    return cache
+
+
+def run_one(path, strategy):
+    """Solve one maze; runs in its own worker process."""
+    m = Maze(path)
+    started = time.perf_counter()
+    try:
+        m.solve(strategy)
+        path_length = len(m.solution[0])
+    except Exception:
+        path_length = None
+    seconds = time.perf_counter() - started
+    return {
+        "seconds": seconds,
+        "explored": m.num_explored,
+        "path_length": path_length,
+        "states_per_second": m.num_explored / seconds if seconds else 0.0,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def format_row(record):
+    return "  ".join(
+        ("-" if record.get(name) is None else spec.format(record[name])).rjust(width)
+        for name, width, spec in COLUMNS)
+
+
+def compare(results, baseline, tolerance):
+    """Return the records that are slower than their baseline by more than
+    tolerance, after attaching the ratio to every matched record."""
+    old = {(r["kind"], r["cells"], r["strategy"]): r for r in baseline}
+    regressions = []
+    for record in results:
+        before = old.get((record["kind"], record["cells"], record["strategy"]))
+        if before is None or not before.get("seconds") or record.get("seconds") is None:
+            continue
+        record["ratio"] = record["seconds"] / before["seconds"]
+        if record["ratio"] > tolerance:
+            regressions.append(record)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark maze solving strategies.")
+    parser.add_argument("--min-cells", type=int, default=LADDER[0])
+    parser.add_argument("--max-cells", type=int, default=LADDER[-1])
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=STRATEGIES)
+    parser.add_argument("--kind", default="binary", choices=generate.KINDS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=600, help="seconds allowed per run")
+    parser.add_argument("--dir", help="where to keep generated mazes (default: a temporary directory)")
+    parser.add_argument("--json", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="earlier --json output to check against")
+    parser.add_argument("--tolerance", type=float, default=1.25,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="maze-bench-")
+    os.makedirs(directory, exist_ok=True)
+
+    print("  ".join(name.rjust(width) for name, width, _ in COLUMNS))
+    results = []
+    for cells in LADDER:
+        if not args.min_cells <= cells <= args.max_cells:
+            continue
+        path = maze_file(cells, args.kind, args.seed, directory)
+        for strategy in args.strategies:
+            record = {"kind": args.kind, "cells": cells, "strategy": strategy}
+            with Pool(1) as pool:
+                try:
+                    record.update(pool.apply_async(run_one, (path, strategy)).get(args.timeout))
+                except Exception as e:
+                    record["error"] = str(e) or type(e).__name__
+            results.append(record)
+            print(format_row(record), flush=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for record in regressions:
+            print("regression: {} cells, {}: {:.2f}x slower".format(
+                record["cells"], record["strategy"], record["ratio"]), file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
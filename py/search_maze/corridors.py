@@ -0,0 +1,144 @@
+import numpy as np
+
+from maze import MOVES, astar
+
+
+class CorridorGraph():
+    """A Maze reduced to the cells where the search has a real choice.
+
+    Dead ends are filled first: any open cell other than the start or goal
+    with at most one open neighbor is walled up, repeatedly, which on a
+    perfect maze leaves only the solution. The remaining cells with exactly
+    two open neighbors are corridor cells; they are collapsed into weighted
+    edges between the junctions at their ends (every other open cell, plus
+    the start and goal). An edge remembers the move that leaves its first
+    junction, so the corridor can be walked again to recover its cells.
+
+    The graph is built for one start/goal pair; see Maze.solve_corridors,
+    which caches it on the maze."""
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.width = width = maze.width
+        self.start = maze.cell_id(maze.start)
+        self.goal = maze.cell_id(maze.goal)
+        self.offsets = (-width, width, -1, 1)
+        self.walls = bytearray(maze.walls)
+        self.filled = self.fill_dead_ends()
+
+        degrees = self.degrees()
+        junctions = np.nonzero((np.frombuffer(self.walls, dtype=np.uint8) == 0) & (degrees != 2))[0]
+        self.junctions = set(junctions.tolist())
+        self.junctions.update((self.start, self.goal))
+
+        # edges[junction] = [(other junction, corridor length, first move)]
+        self.edges = {}
+        for junction in self.junctions:
+            self.edges[junction] = edges = []
+            for move, cell in self.adjacent(junction):
+                end, length = self.walk(junction, cell)
+                if end != junction:
+                    edges.append((end, length, move))
+
+    def degrees(self):
+        """Number of open neighbors of every cell, as a flat NumPy array."""
+        height, width = self.maze.height, self.width
+        is_open = (np.frombuffer(self.walls, dtype=np.uint8) == 0).reshape(height, width)
+        degrees = np.zeros((height, width), dtype=np.uint8)
+        degrees[1:, :] += is_open[:-1, :]
+        degrees[:-1, :] += is_open[1:, :]
+        degrees[:, 1:] += is_open[:, :-1]
+        degrees[:, :-1] += is_open[:, 1:]
+        return degrees.reshape(-1)
+
+    def adjacent(self, cell):
+        """Yield (move index, cell) for each open neighbor of cell."""
+        walls, width = self.walls, self.width
+        row, col = divmod(cell, width)
+        if row > 0 and not walls[cell - width]:
+            yield 0, cell - width
+        if row < self.maze.height - 1 and not walls[cell + width]:
+            yield 1, cell + width
+        if col > 0 and not walls[cell - 1]:
+            yield 2, cell - 1
+        if col < width - 1 and not walls[cell + 1]:
+            yield 3, cell + 1
+
+    def fill_dead_ends(self):
+        """Wall up dead ends until none are left; return how many cells
+        were filled."""
+        is_open = np.frombuffer(self.walls, dtype=np.uint8) == 0
+        degrees = self.degrees()
+        stack = np.nonzero(is_open & (degrees <= 1))[0].tolist()
+        degree = bytearray(degrees.tobytes())
+        keep = (self.start, self.goal)
+
+        filled = 0
+        while stack:
+            cell = stack.pop()
+            if self.walls[cell] or cell in keep or degree[cell] > 1:
+                continue
+            self.walls[cell] = 1
+            filled += 1
+            for _, neighbor in self.adjacent(cell):
+                degree[neighbor] -= 1
+                if degree[neighbor] <= 1:
+                    stack.append(neighbor)
+        return filled
+
+    def walk(self, junction, cell):
+        """Follow the corridor entered from junction at cell; return the
+        junction it ends at and its length in steps."""
+        previous, length = junction, 1
+        while cell not in self.junctions:
+            for _, neighbor in self.adjacent(cell):
+                if neighbor != previous:
+                    previous, cell = cell, neighbor
+                    break
+            length += 1
+        return cell, length
+
+    def corridor(self, junction, move):
+        """Yield (move index, cell) for every step of the corridor that
+        leaves junction by move, ending at the next junction."""
+        previous, cell = junction, junction + self.offsets[move]
+        yield move, cell
+        while cell not in self.junctions:
+            for move, neighbor in self.adjacent(cell):
+                if neighbor != previous:
+                    previous, cell = cell, neighbor
+                    break
+            yield move, cell
+
+    def search(self, explored=None, on_expand=None, stats=None):
+        """A* over the junction graph with a Manhattan heuristic. Returns the
+        (actions, cells) solution with every corridor cell filled back in.
+        Expanded junctions are added to explored and passed to on_expand;
+        stats is a maze.SolveStats."""
+        width = self.width
+        goal_row, goal_col = divmod(self.goal, width)
+
+        def heuristic(cell):
+            row, col = divmod(cell, width)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        def successors(junction, _):
+            return self.edges[junction]
+
+        return astar(self.start, self.goal, successors, heuristic, self.expand_path,
+                     explored, on_expand, stats, lambda junction: divmod(junction, width))
+
+    def expand_path(self, parents):
+        legs = []
+        junction = self.goal
+        while parents[junction] is not None:
+            junction, move = parents[junction]
+            legs.append((junction, move))
+
+        actions = []
+        cells = []
+        for junction, move in reversed(legs):
+            for step, cell in self.corridor(junction, move):
+                actions.append(MOVES[step])
+                cells.append(divmod(cell, self.width))
+        return (actions, cells)
@@ -0,0 +1,148 @@
+import heapq
+import itertools
+import math
+
+from jps import ACTIONS
+
+
+class DStarLite():
+    """Incremental shortest-path planner for a Maze whose walls change while
+    an agent follows the route (D* Lite, Koenig & Likhachev 2002).
+
+    The search runs backwards from the goal and keeps its g/rhs values and
+    queue between calls, so after set_wall() or move_to() the next plan()
+    only re-expands the cells whose distance to the goal actually changed.
+
+        planner = DStarLite(maze)
+        actions, cells = planner.plan()
+        planner.move_to(cells[0])
+        planner.set_wall((3, 4))
+        actions, cells = planner.plan()
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.start = self.last = maze.start
+        self.goal = maze.goal
+        self.km = 0
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.queue = []
+        self.queued = {}
+        self.counter = itertools.count()
+        self.num_explored = 0
+        self.push(self.goal)
+
+    def heuristic(self, state):
+        return abs(state[0] - self.start[0]) + abs(state[1] - self.start[1])
+
+    def key(self, state):
+        best = min(self.g.get(state, math.inf), self.rhs.get(state, math.inf))
+        return (best + self.heuristic(state) + self.km, best)
+
+    def push(self, state):
+        key = self.key(state)
+        self.queued[state] = key
+        heapq.heappush(self.queue, (key, next(self.counter), state))
+
+    def top(self):
+        """Drop stale queue entries and return the smallest live one."""
+        while self.queue:
+            key, _, state = self.queue[0]
+            if self.queued.get(state) == key:
+                return key, state
+            heapq.heappop(self.queue)
+        return (math.inf, math.inf), None
+
+    def adjacent(self, state):
+        """All in-bounds cells next to state, walls included."""
+        row, col = state
+        for drow, dcol in ACTIONS:
+            r, c = row + drow, col + dcol
+            if 0 <= r < self.maze.height and 0 <= c < self.maze.width:
+                yield (r, c)
+
+    def cost(self, a, b):
+        maze = self.maze
+        if maze.walls[maze.cell_id(a)] or maze.walls[maze.cell_id(b)]:
+            return math.inf
+        return 1
+
+    def update_vertex(self, state):
+        if state != self.goal:
+            self.rhs[state] = min(
+                (self.cost(state, s) + self.g.get(s, math.inf) for s in self.adjacent(state)),
+                default=math.inf)
+        self.queued.pop(state, None)
+        if self.g.get(state, math.inf) != self.rhs.get(state, math.inf):
+            self.push(state)
+
+    def compute_shortest_path(self):
+        g, rhs = self.g, self.rhs
+        while True:
+            key, state = self.top()
+            start_g = g.get(self.start, math.inf)
+            start_rhs = rhs.get(self.start, math.inf)
+            if state is None or (key >= self.key(self.start) and start_rhs == start_g):
+                return
+            heapq.heappop(self.queue)
+            del self.queued[state]
+            self.num_explored += 1
+
+            new_key = self.key(state)
+            if key < new_key:
+                self.push(state)
+            elif g.get(state, math.inf) > rhs.get(state, math.inf):
+                g[state] = rhs[state]
+                for s in self.adjacent(state):
+                    self.update_vertex(s)
+            else:
+                g[state] = math.inf
+                self.update_vertex(state)
+                for s in self.adjacent(state):
+                    self.update_vertex(s)
+
+    def plan(self):
+        """Repair the search and return the (actions, cells) route from the
+        current start to the goal. Raises Exception if there is none."""
+        self.num_explored = 0
+        self.compute_shortest_path()
+        if self.g.get(self.start, math.inf) == math.inf:
+            raise Exception("no solution")
+
+        actions = []
+        cells = []
+        state = self.start
+        while state != self.goal:
+            previous = state
+            state = min(self.adjacent(previous),
+                        key=lambda s: self.cost(previous, s) + self.g.get(s, math.inf))
+            actions.append(ACTIONS[(state[0] - previous[0], state[1] - previous[1])])
+            cells.append(state)
+        self.maze.solution = (actions, cells)
+        return (actions, cells)
+
+    def move_to(self, state):
+        """Record that the agent now stands at state."""
+        self.start = state
+        self.maze.start = state
+
+    def set_wall(self, state, wall=True):
+        """Open or close the cell at state and queue the cells it affects."""
+        self.update_walls([(state, wall)])
+
+    def update_walls(self, changes):
+        """Apply several (state, wall) toggles, then queue affected cells."""
+        if self.start != self.last:
+            self.km += abs(self.last[0] - self.start[0]) + abs(self.last[1] - self.start[1])
+            self.last = self.start
+
+        touched = set()
+        for state, wall in changes:
+            if wall and state in (self.start, self.goal):
+                raise ValueError("cannot put a wall on the start or goal")
+            self.maze.set_wall(state, wall)
+            touched.add(state)
+            touched.update(self.adjacent(state))
+        for state in touched:
+            self.update_vertex(state)
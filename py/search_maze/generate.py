@@ -0,0 +1,128 @@
+"""Generate synthetic mazes in the text format read by maze.Maze.
+
+Usage: python generate.py HEIGHT WIDTH OUTPUT [--kind KIND] [--density D]
+                          [--loops L] [--seed N]
+
+Kinds:
+    noise        independent random walls with probability density; the
+                 start and goal are not guaranteed to be connected
+    binary       binary-tree maze: one-cell corridors, always solvable,
+                 generated with array operations so 1e8 cells is practical
+    backtracker  recursive-backtracker maze: long winding corridors and
+                 many dead ends, always solvable, but carved cell by cell
+
+For the corridor kinds, loops is the fraction of remaining inner walls that
+are knocked out afterwards to add cycles.
+"""
+
+import argparse
+import random
+
+import numpy as np
+
+KINDS = ("noise", "binary", "backtracker")
+
+WALL = ord("#")
+OPEN = ord(" ")
+
+
+def generate(height, width, kind="binary", density=0.3, loops=0.0, seed=None):
+    """Return a height x width uint8 array of maze characters."""
+    if kind not in KINDS:
+        raise ValueError("unknown maze kind: {}".format(kind))
+    if kind != "noise" and ((height - 1) // 2) * ((width - 1) // 2) < 2:
+        raise ValueError("corridor mazes need room for at least two cells, e.g. 3 x 5")
+
+    rng = np.random.default_rng(seed)
+    if kind == "noise":
+        grid = np.where(rng.random((height, width)) < density, WALL, OPEN).astype(np.uint8)
+        start, goal = (height - 1, 0), (0, width - 1)
+    else:
+        rows, cols = (height - 1) // 2, (width - 1) // 2
+        grid = np.full((height, width), WALL, dtype=np.uint8)
+        grid[1:2 * rows:2, 1:2 * cols:2] = OPEN
+        if kind == "binary":
+            carve_binary_tree(grid, rows, cols, rng)
+        else:
+            carve_backtracker(grid, rows, cols, random.Random(seed))
+        if loops:
+            knock_out_walls(grid, rows, cols, loops, rng)
+        start, goal = (2 * rows - 1, 1), (1, 2 * cols - 1)
+
+    grid[start] = ord("A")
+    grid[goal] = ord("B")
+    return grid
+
+
+def carve_binary_tree(grid, rows, cols, rng):
+    """Open, for every cell, the wall to its north or to its east at random.
+    Cells on the top row can only go east and cells in the last column only
+    north, which connects everything to the top-right cell."""
+    north = rng.random((rows, cols)) < 0.5
+    north[0, :] = False
+    north[:, -1] = True
+    north[0, -1] = False
+    east = ~north
+    east[0, -1] = False
+
+    # Cell (r, c) sits at grid (2r + 1, 2c + 1)
+    r, c = np.nonzero(north)
+    grid[2 * r, 2 * c + 1] = OPEN
+    r, c = np.nonzero(east)
+    grid[2 * r + 1, 2 * c + 2] = OPEN
+
+
+def carve_backtracker(grid, rows, cols, rng):
+    """Carve a spanning tree of the cells with an iterative randomized DFS."""
+    visited = bytearray(rows * cols)
+    stack = [(0, 0)]
+    visited[0] = 1
+    while stack:
+        row, col = stack[-1]
+        options = [
+            (r, c) for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+            if 0 <= r < rows and 0 <= c < cols and not visited[r * cols + c]
+        ]
+        if not options:
+            stack.pop()
+            continue
+        r, c = rng.choice(options)
+        visited[r * cols + c] = 1
+        grid[row + r + 1, col + c + 1] = OPEN
+        stack.append((r, c))
+
+
+def knock_out_walls(grid, rows, cols, fraction, rng):
+    """Open a random fraction of the walls that separate two cells."""
+    between_rows = grid[2:2 * rows - 1:2, 1:2 * cols:2]
+    between_cols = grid[1:2 * rows:2, 2:2 * cols - 1:2]
+    for walls in (between_rows, between_cols):
+        walls[rng.random(walls.shape) < fraction] = OPEN
+
+
+def write(grid, filename):
+    """Write a character grid as a text maze, one row per line."""
+    lines = np.empty((grid.shape[0], grid.shape[1] + 1), dtype=np.uint8)
+    lines[:, :-1] = grid
+    lines[:, -1] = ord("\n")
+    with open(filename, "wb") as f:
+        f.write(lines.tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic maze.")
+    parser.add_argument("height", type=int)
+    parser.add_argument("width", type=int)
+    parser.add_argument("output")
+    parser.add_argument("--kind", default="binary", choices=KINDS)
+    parser.add_argument("--density", type=float, default=0.3, help="wall probability for noise mazes")
+    parser.add_argument("--loops", type=float, default=0.0, help="fraction of inner walls to remove")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    write(generate(args.height, args.width, args.kind, args.density, args.loops, args.seed),
+          args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import zlib
+from collections import deque
+
+import numpy as np
+
+from jps import ACTIONS
+from maze import astar
+
+# Entrances at least this long get a transition at each end instead of one
+# in the middle (Botea, Mueller & Schaeffer 2004)
+LONG_ENTRANCE = 6
+
+
+class HierarchicalGraph():
+    """Hierarchical pathfinding (HPA*) for very large Maze grids.
+
+    The grid is cut into cluster_size x cluster_size clusters. Wherever two
+    neighboring clusters share a run of open cells across their border, the
+    run becomes an entrance with one or two transitions, and the cells on
+    either side become abstract nodes joined by a unit edge. Inside each
+    cluster, the distance between every pair of its abstract nodes is found
+    once with a breadth-first search confined to the cluster.
+
+    A query links the start and goal into the abstract graph with searches
+    of their own clusters, runs A* on the abstract graph, and then refines
+    only the cluster crossings on the chosen route back into cells. Paths
+    are near-optimal rather than always shortest, as usual for HPA*.
+
+    The abstract graph can be written with save() and read back with load(),
+    so repeated runs on the same map skip the build."""
+
+    def __init__(self, maze, cluster_size=32, edges=None):
+        self.maze = maze
+        self.width = maze.width
+        self.cluster_size = cluster_size
+        self.nodes_in = {}
+        self.edges = {}
+        if edges is None:
+            self.build()
+        else:
+            for a, b, cost in edges:
+                self.connect(a, b, cost)
+
+    def cluster(self, cell):
+        row, col = divmod(cell, self.width)
+        return (row // self.cluster_size, col // self.cluster_size)
+
+    def bounds(self, cluster):
+        """Return (top, left, bottom, right) of a cluster, exclusive at the
+        bottom right."""
+        size = self.cluster_size
+        top, left = cluster[0] * size, cluster[1] * size
+        return (top, left, min(top + size, self.maze.height), min(left + size, self.width))
+
+    def add_node(self, cell):
+        if cell not in self.edges:
+            self.edges[cell] = {}
+            self.nodes_in.setdefault(self.cluster(cell), []).append(cell)
+
+    def connect(self, a, b, cost):
+        self.add_node(a)
+        self.add_node(b)
+        if cost < self.edges[a].get(b, cost + 1):
+            self.edges[a][b] = cost
+            self.edges[b][a] = cost
+
+    def build(self):
+        maze, size, width = self.maze, self.cluster_size, self.width
+        walls = maze.walls
+
+        def add_entrance(run):
+            """run is a list of (cell, cell across the border) pairs."""
+            if len(run) >= LONG_ENTRANCE:
+                transitions = (run[0], run[-1])
+            else:
+                transitions = (run[len(run) // 2],)
+            for a, b in transitions:
+                self.connect(a, b, 1)
+
+        # Borders between horizontally neighboring clusters
+        for col in range(size - 1, width - 1, size):
+            run = []
+            for row in range(maze.height):
+                cell = row * width + col
+                if row % size == 0 and run:
+                    add_entrance(run)
+                    run = []
+                if not walls[cell] and not walls[cell + 1]:
+                    run.append((cell, cell + 1))
+                elif run:
+                    add_entrance(run)
+                    run = []
+            if run:
+                add_entrance(run)
+
+        # Borders between vertically neighboring clusters
+        for row in range(size - 1, maze.height - 1, size):
+            run = []
+            for col in range(width):
+                cell = row * width + col
+                if col % size == 0 and run:
+                    add_entrance(run)
+                    run = []
+                if not walls[cell] and not walls[cell + width]:
+                    run.append((cell, cell + width))
+                elif run:
+                    add_entrance(run)
+                    run = []
+            if run:
+                add_entrance(run)
+
+        # Distances between the abstract nodes of each cluster
+        for cluster, nodes in list(self.nodes_in.items()):
+            for i, node in enumerate(nodes):
+                distances, _ = self.local_search(node, cluster, nodes[i + 1:])
+                for other in nodes[i + 1:]:
+                    if other in distances:
+                        self.connect(node, other, distances[other])
+
+    def local_search(self, source, cluster, targets=()):
+        """Breadth-first search from source that never leaves cluster, stopping
+        early once every target is reached. Returns (distances, parents)."""
+        top, left, bottom, right = self.bounds(cluster)
+        walls, width = self.maze.walls, self.width
+        distances = {source: 0}
+        parents = {source: None}
+        remaining = set(targets) - {source}
+        queue = deque([source])
+        while queue and (remaining or not targets):
+            cell = queue.popleft()
+            row, col = divmod(cell, width)
+            for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                neighbor = r * width + c
+                if (top <= r < bottom and left <= c < right and not walls[neighbor]
+                        and neighbor not in distances):
+                    distances[neighbor] = distances[cell] + 1
+                    parents[neighbor] = cell
+                    remaining.discard(neighbor)
+                    queue.append(neighbor)
+        return distances, parents
+
+    def links(self, cell, other=None):
+        """Edges from cell to the abstract nodes of its cluster, plus to other
+        if it shares the cluster, for inserting a query endpoint."""
+        cluster = self.cluster(cell)
+        targets = list(self.nodes_in.get(cluster, ()))
+        if other is not None and self.cluster(other) == cluster:
+            targets.append(other)
+        distances, _ = self.local_search(cell, cluster, targets)
+        return {target: distances[target] for target in targets if target in distances}
+
+    def search(self, explored=None, on_expand=None, stats=None):
+        """Return the (actions, cells) route from the maze's start to its goal.
+        Expanded abstract nodes are added to explored and passed to on_expand;
+        stats is a maze.SolveStats."""
+        maze, width = self.maze, self.width
+        start, goal = maze.cell_id(maze.start), maze.cell_id(maze.goal)
+        goal_row, goal_col = maze.goal
+
+        # Temporary edges for the endpoints; the stored graph is not changed
+        start_links = self.links(start, goal)
+        goal_links = self.links(goal)
+
+        def successors(node, _):
+            edges = dict(self.edges.get(node, {}))
+            if node == start:
+                edges.update(start_links)
+            if node in goal_links:
+                edges[goal] = min(goal_links[node], edges.get(goal, goal_links[node]))
+            return ((neighbor, cost, None) for neighbor, cost in edges.items())
+
+        def heuristic(cell):
+            row, col = divmod(cell, width)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        return astar(start, goal, successors, heuristic, lambda parents: self.refine(parents, goal),
+                     explored, on_expand, stats, lambda node: divmod(node, width))
+
+    def refine(self, parents, goal):
+        """Turn the abstract route ending at goal into (actions, cells)."""
+        route = [goal]
+        while parents[route[-1]] is not None:
+            route.append(parents[route[-1]][0])
+        route.reverse()
+
+        width = self.width
+        actions = []
+        cells = []
+        for a, b in zip(route, route[1:]):
+            cluster = self.cluster(a)
+            if self.cluster(b) != cluster:
+                steps = [b]
+            else:
+                _, came_from = self.local_search(a, cluster, [b])
+                steps = []
+                cell = b
+                while cell != a:
+                    steps.append(cell)
+                    cell = came_from[cell]
+                steps.reverse()
+            previous = divmod(a, width)
+            for cell in steps:
+                state = divmod(cell, width)
+                actions.append(ACTIONS[(state[0] - previous[0], state[1] - previous[1])])
+                cells.append(state)
+                previous = state
+        return (actions, cells)
+
+    def save(self, filename):
+        """Write the abstract graph as a NumPy .npz archive."""
+        edges = [(a, b, cost) for a, links in self.edges.items()
+                 for b, cost in links.items() if a < b]
+        edges = np.array(edges, dtype=np.int64).reshape(-1, 3)
+        np.savez(filename, edges=edges, meta=np.array([
+            self.maze.height, self.maze.width, self.cluster_size,
+            zlib.crc32(self.maze.walls),
+        ], dtype=np.int64))
+
+    @classmethod
+    def load(cls, filename, maze):
+        """Read a graph written by save() for this maze. Raises Exception if
+        it was built for a different grid."""
+        with np.load(filename) as archive:
+            height, width, cluster_size, checksum = archive["meta"].tolist()
+            edges = archive["edges"].tolist()
+        if (height, width) != (maze.height, maze.width) or checksum != zlib.crc32(maze.walls):
+            raise Exception("hierarchy was built for a different maze")
+        return cls(maze, cluster_size, edges)
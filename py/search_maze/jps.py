@@ -0,0 +1,102 @@
+from maze import astar
+
+# Action taken for each unit step (drow, dcol), as named by Maze.neighbors
+ACTIONS = {(-1, 0): "up", (1, 0): "down", (0, -1): "left", (0, 1): "right"}
+
+
+def jump_point_search(maze, explored=None, on_expand=None, stats=None):
+    """Jump Point Search over a 4-connected, uniform-cost Maze.
+
+    Paths are kept canonical by preferring vertical moves before horizontal
+    ones: a vertical run may turn left or right at any cell, but a horizontal
+    run only turns where a wall behind it makes the turn forced. Runs are
+    scanned by the jump functions without touching the heap, and A* with a
+    Manhattan heuristic searches only the jump points where they stop.
+
+    Returns the same (actions, cells) tuple as Maze.solve, with every cell
+    between consecutive jump points filled back in. If explored is a set,
+    the expanded jump points are added to it, and on_expand is called with
+    each of them, and a maze.SolveStats passed as stats is filled in. Raises
+    Exception if the goal cannot be reached."""
+
+    walls, width, height = maze.walls, maze.width, maze.height
+    goal = maze.goal
+
+    def is_open(row, col):
+        return 0 <= row < height and 0 <= col < width and not walls[row * width + col]
+
+    def jump_horizontal(row, col, dcol):
+        while True:
+            col += dcol
+            if not is_open(row, col):
+                return None
+            if (row, col) == goal:
+                return (row, col)
+            # A turn is forced when the cell above (or below) is open but the
+            # one diagonally behind it is not, so nothing canonical reaches it.
+            for drow in (-1, 1):
+                if is_open(row + drow, col) and not is_open(row + drow, col - dcol):
+                    return (row, col)
+
+    def jump_vertical(row, col, drow):
+        while True:
+            row += drow
+            if not is_open(row, col):
+                return None
+            if ((row, col) == goal
+                    or jump_horizontal(row, col, -1) is not None
+                    or jump_horizontal(row, col, 1) is not None):
+                return (row, col)
+
+    def successors(state, direction):
+        row, col = state
+        if direction is None:
+            directions = list(ACTIONS)
+        elif direction[0] == 0:
+            dcol = direction[1]
+            directions = [direction] + [
+                (drow, 0) for drow in (-1, 1)
+                if is_open(row + drow, col) and not is_open(row + drow, col - dcol)
+            ]
+        else:
+            directions = [direction, (0, -1), (0, 1)]
+
+        for drow, dcol in directions:
+            if drow:
+                point = jump_vertical(row, col, drow)
+            else:
+                point = jump_horizontal(row, col, dcol)
+            if point is not None:
+                yield point, (drow, dcol)
+
+    def heuristic(state):
+        return abs(state[0] - goal[0]) + abs(state[1] - goal[1])
+
+    def jumps(state, direction):
+        for point, step in successors(state, direction):
+            yield point, abs(point[0] - state[0]) + abs(point[1] - state[1]), step
+
+    return astar(maze.start, goal, jumps, heuristic, lambda parents: expand_path(parents, goal),
+                 explored, on_expand, stats)
+
+
+def expand_path(parents, goal):
+    """Walk the jump point parents back from goal and fill in the straight
+    runs between them, returning (actions, cells) in start-to-goal order."""
+    actions = []
+    cells = []
+    state = goal
+    while parents[state] is not None:
+        parent, _ = parents[state]
+        drow = (state[0] > parent[0]) - (state[0] < parent[0])
+        dcol = (state[1] > parent[1]) - (state[1] < parent[1])
+        action = ACTIONS[(drow, dcol)]
+        cell = state
+        while cell != parent:
+            actions.append(action)
+            cells.append(cell)
+            cell = (cell[0] - drow, cell[1] - dcol)
+        state = parent
+    actions.reverse()
+    cells.reverse()
+    return (actions, cells)
@@ -0,0 +1,305 @@
+import heapq
+import itertools
+import time
+from array import array
+
+
+class ConflictBasedSearch():
+    """Collision-free paths for several agents moving through one Maze at
+    the same time (conflict-based search, Sharon et al. 2015).
+
+    Every agent moves one cell or waits in place per time step, and stays
+    on its goal once it gets there. Two agents may not be in the same cell
+    at the same time, nor swap cells in one step.
+
+    The high level searches a tree of constraint sets, cheapest total path
+    length first. Each tree node plans every agent on its own, finds the
+    first collision between two of them, and splits into two children that
+    forbid that cell (or that swap) at that time to one agent or the other.
+    The low level is A* over (cell, time) that respects an agent's
+    constraints. It uses a space-time reservation table of the other
+    agents' paths to prefer, among equally short paths, the one that runs
+    into them least, which keeps the tree small. A replanned path that is no
+    longer and collides less is taken into the node itself rather than
+    splitting it (bypassing, Boyarski et al. 2015).
+
+        planner = ConflictBasedSearch(maze, [((0, 0), (5, 7)), ((5, 0), (0, 7))])
+        paths = planner.plan()
+
+    With heuristic="distance" the low level is guided by the true distance
+    to each goal, from one Maze.distance_field per goal (4 bytes per cell
+    each); "manhattan" needs no tables but expands more on maze-like grids.
+    """
+
+    def __init__(self, maze, agents, heuristic="distance", max_nodes=10000):
+        self.maze = maze
+        self.width = maze.width
+        self.agents = [(maze.cell_id(start), maze.cell_id(goal)) for start, goal in agents]
+        self.heuristic = heuristic
+        self.max_nodes = max_nodes
+        self.tables = {}
+
+        for name, cells in (("start", [s for s, _ in self.agents]), ("goal", [g for _, g in self.agents])):
+            if len(set(cells)) != len(cells):
+                raise ValueError("agents must have distinct {} cells".format(name))
+            for cell in cells:
+                if not 0 <= cell < maze.height * maze.width or maze.walls[cell]:
+                    raise ValueError("agent {} {} is not an open cell".format(
+                        name, maze.cell_state(cell)))
+        if heuristic not in ("distance", "manhattan"):
+            raise ValueError("unknown heuristic: {}".format(heuristic))
+
+        # Space-time reservation table: occupied maps (cell, time) to the
+        # agents there, parked maps a goal to (arrival time, agent), and
+        # reserved holds the path each agent has in the table
+        self.occupied = {}
+        self.parked = {}
+        self.reserved = [None] * len(self.agents)
+
+        self.paths = None
+        self.num_expanded = 0
+        self.num_generated = 0
+        self.num_low_level = 0
+        self.seconds = 0.0
+
+    def distances(self, goal):
+        """Return a function giving the remaining distance from a cell to
+        goal, or -1 if goal cannot be reached from it."""
+        if self.heuristic == "manhattan":
+            width = self.width
+            goal_row, goal_col = divmod(goal, width)
+
+            def manhattan(cell):
+                row, col = divmod(cell, width)
+                return abs(row - goal_row) + abs(col - goal_col)
+            return manhattan
+
+        if goal not in self.tables:
+            field = self.maze.distance_field([self.maze.cell_state(goal)])
+            self.tables[goal] = array("i", field.astype("int32").tobytes())
+        return self.tables[goal].__getitem__
+
+    def adjacent(self, cell):
+        """Yield cell itself (waiting) and every open cell next to it."""
+        walls, width = self.maze.walls, self.width
+        row, col = divmod(cell, width)
+        yield cell
+        if row > 0 and not walls[cell - width]:
+            yield cell - width
+        if row < self.maze.height - 1 and not walls[cell + width]:
+            yield cell + width
+        if col > 0 and not walls[cell - 1]:
+            yield cell - 1
+        if col < width - 1 and not walls[cell + 1]:
+            yield cell + 1
+
+    def reserve(self, agent, path):
+        """Put path in the reservation table as agent's, replacing the path
+        it had there."""
+        occupied = self.occupied
+        old = self.reserved[agent]
+        if old is not None:
+            for t, cell in enumerate(old):
+                agents = occupied[cell, t]
+                agents.remove(agent)
+                if not agents:
+                    del occupied[cell, t]
+            del self.parked[old[-1]]
+        for t, cell in enumerate(path):
+            occupied.setdefault((cell, t), []).append(agent)
+        self.parked[path[-1]] = (len(path) - 1, agent)
+        self.reserved[agent] = path
+
+    def switch_to(self, paths):
+        """Make the reservation table hold paths. Tree nodes share the paths
+        of the agents they did not replan, so only those that differ from
+        the table's are swapped."""
+        for agent, path in enumerate(paths):
+            if self.reserved[agent] is not path:
+                self.reserve(agent, path)
+
+    def find_path(self, agent, constraints):
+        """Space-time A* for one agent. constraints holds the (cell, time)
+        and (from cell, to cell, time) moves it may not make; the other
+        agents' reservations are used to break ties. Returns the agent's
+        cells from time 0 until it reaches its goal for good, or None."""
+        start, goal = self.agents[agent]
+        remaining = self.distances(goal)
+        if remaining(start) < 0:
+            return None
+        occupied, parked = self.occupied, self.parked
+
+        # After the last constrained time, (cell, t) and (cell, t + 1) lead
+        # to the same futures, so closed states are keyed on min(t, horizon)
+        horizon = max((c[-1] for c in constraints), default=0) + 1
+        # The agent may only stop for good after its goal is last forbidden,
+        # so until then the time left is a lower bound too; without it A*
+        # would fill the whole space-time region before that time
+        settle = max((c[1] for c in constraints if len(c) == 2 and c[0] == goal), default=-1)
+
+        counter = itertools.count()
+        # Ties on f go to fewer collisions with the reservations, then to
+        # the later time, i.e. the state further along its path
+        frontier = [(max(remaining(start), settle + 1), 0, 0, next(counter), start, 0, None)]
+        parents = {}
+        closed = set()
+        while frontier:
+            _, conflicts, _, _, cell, t, parent = heapq.heappop(frontier)
+            key = (cell, min(t, horizon))
+            if key in closed:
+                continue
+            closed.add(key)
+            parents[cell, t] = parent
+            self.num_low_level += 1
+
+            if cell == goal and t > settle:
+                path = []
+                state = (cell, t)
+                while state is not None:
+                    path.append(state[0])
+                    state = parents[state]
+                path.reverse()
+                return path
+
+            for neighbor in self.adjacent(cell):
+                h = remaining(neighbor)
+                if (h < 0 or (neighbor, t + 1) in constraints
+                        or (cell, neighbor, t + 1) in constraints
+                        or (neighbor, min(t + 1, horizon)) in closed):
+                    continue
+                hits = 0
+                others = occupied.get((neighbor, t + 1))
+                if others:
+                    hits = len(others) - (agent in others)
+                arrival, other = parked.get(neighbor, (t + 2, agent))
+                if arrival <= t + 1 and other != agent:
+                    hits += 1
+                heapq.heappush(frontier, (t + 1 + max(h, settle - t), conflicts + hits, -t - 1, next(counter),
+                                          neighbor, t + 1, (cell, t)))
+        return None
+
+    def collisions(self, agent, path):
+        """Return the collisions between path, as agent's, and every other
+        path in the reservation table. A collision is (time, agent, other
+        agent, constraint for agent, constraint for the other), with
+        constraints as in find_path."""
+        occupied, parked = self.occupied, self.parked
+        found = []
+        end = max((len(p) for p in self.reserved if p is not None), default=0)
+        for t in range(max(end, len(path))):
+            cell = path[min(t, len(path) - 1)]
+            others = [other for other in occupied.get((cell, t), ()) if other != agent]
+            arrival, other = parked.get(cell, (t + 1, agent))
+            if arrival < t and other != agent:
+                others.append(other)
+            for other in others:
+                found.append((t, agent, other, (cell, t), (cell, t)))
+
+            # Swaps: another agent moving from cell to where path came from
+            if 0 < t < len(path) and path[t - 1] != cell:
+                before = occupied.get((cell, t - 1), ())
+                after = occupied.get((path[t - 1], t), ())
+                for other in before:
+                    if other != agent and other in after:
+                        found.append((t, agent, other, (path[t - 1], cell, t), (cell, path[t - 1], t)))
+        return found
+
+    def plan(self):
+        """Return one path per agent, each a list of (row, col) cells from
+        time 0 to the time the last agent arrives (agents that arrive early
+        wait on their goals). Raises Exception if there is no solution or
+        max_nodes constraint-tree nodes were generated without finding one.
+        num_expanded, num_generated, num_low_level and seconds are left
+        with the size and duration of the search."""
+        started = time.perf_counter()
+        self.num_expanded = self.num_generated = self.num_low_level = 0
+        self.occupied = {}
+        self.parked = {}
+        self.reserved = [None] * len(self.agents)
+        try:
+            paths = self.search()
+        finally:
+            self.seconds = time.perf_counter() - started
+
+        makespan = max(len(path) for path in paths)
+        self.paths = [
+            [self.maze.cell_state(cell) for cell in path + path[-1:] * (makespan - len(path))]
+            for path in paths
+        ]
+        return self.paths
+
+    def search(self):
+        agents = len(self.agents)
+        no_constraints = frozenset()
+
+        # Plan the root one agent at a time, each avoiding those before it
+        paths = []
+        conflicts = []
+        for agent in range(agents):
+            path = self.find_path(agent, no_constraints)
+            if path is None:
+                raise Exception("no solution")
+            conflicts += self.collisions(agent, path)
+            self.reserve(agent, path)
+            paths.append(path)
+
+        # A tree node is [cost, collisions, tiebreak, constraints, paths,
+        # conflicts]; the first three order the tree
+        counter = itertools.count()
+        cost = sum(len(path) - 1 for path in paths)
+        tree = [[cost, len(conflicts), next(counter), [no_constraints] * agents, paths, conflicts]]
+        self.num_generated = 1
+
+        while tree:
+            node = heapq.heappop(tree)
+            cost, _, _, constraints, paths, conflicts = node
+            self.num_expanded += 1
+            if not conflicts:
+                return paths
+
+            self.switch_to(paths)
+            _, first, second, first_constraint, second_constraint = min(conflicts)
+            children = []
+            for agent, constraint in ((first, first_constraint), (second, second_constraint)):
+                child = list(constraints)
+                child[agent] = constraints[agent] | {constraint}
+                path = self.find_path(agent, child[agent])
+                if path is None:
+                    continue
+                child_conflicts = [c for c in conflicts if agent not in (c[1], c[2])]
+                child_conflicts += self.collisions(agent, path)
+
+                # Bypass: an equally short path with fewer collisions is
+                # adopted by this node instead of splitting the tree
+                if len(path) == len(paths[agent]) and len(child_conflicts) < len(conflicts):
+                    node[4] = list(paths)
+                    node[4][agent] = path
+                    node[1] = len(child_conflicts)
+                    node[5] = child_conflicts
+                    heapq.heappush(tree, node)
+                    children = []
+                    break
+
+                child_paths = list(paths)
+                child_paths[agent] = path
+                child_cost = cost - len(paths[agent]) + len(path)
+                children.append([child_cost, len(child_conflicts), next(counter),
+                                 child, child_paths, child_conflicts])
+
+            for child in children:
+                if self.num_generated >= self.max_nodes:
+                    raise Exception("no solution within {} nodes".format(self.max_nodes))
+                heapq.heappush(tree, child)
+                self.num_generated += 1
+
+        raise Exception("no solution")
+
+    def as_dict(self):
+        """The size and duration of the last plan(), e.g. for JSON output."""
+        return {
+            "agents": len(self.agents),
+            "expanded": self.num_expanded,
+            "generated": self.num_generated,
+            "low_level_expanded": self.num_low_level,
+            "seconds": self.seconds,
+        }
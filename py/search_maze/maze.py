@@ -1,20 +1,60 @@
+import argparse
+import array
+import heapq
+import itertools
+import json
+import math
+import mmap
+import os
+import shutil
+import struct
 import sys
+import tempfile
+import time
+from collections import deque
+
+# Maps every byte of a text maze to 1 (wall) or 0 (open). Spaces, the start
+# and the goal are open; any other character is a wall.
+WALL_TABLE = bytes(0 if chr(b) in " AB" else 1 for b in range(256))
+
+# A terrain for weighted mazes, for Maze(filename, terrain=DIGIT_TERRAIN): a
+# space costs 1 to step onto and a digit d costs d. See terrain_tables().
+DIGIT_TERRAIN = {" ": 1, **{str(d): d for d in range(1, 10)}}
+
+# Terrains by the name the command lines take with --terrain
+TERRAINS = {"digits": DIGIT_TERRAIN}
+
+# Largest step cost a weighted maze can hold (costs are one byte per cell)
+MAX_STEP_COST = 255
+
+# Binary cache: a fixed header followed by the raw row-major wall bytes, so a
+# cached maze can be mapped straight into Maze.walls without copying. Weighted
+# mazes use WEIGHTED_MAGIC and store their step cost bytes after the walls.
+CACHE_MAGIC = b"MAZ1"
+WEIGHTED_MAGIC = b"MAZW"
+CACHE_HEADER = struct.Struct("<4s6I")
 
 class Node():
-    def __init__(self, state, parent, action):
+    def __init__(self, state, parent, action, cost=0):
         self.state = state
         self.parent = parent
         self.action = action
+        self.cost = cost
 
 class StackFrontier(): 
+    """Last-in first-out frontier. Nodes live in a deque and their states in a
+    set alongside it, so add, remove and contains_state are all O(1)."""
+
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+        self.states = set()
 
     def add(self, node):
         self.frontier.append(node)
+        self.states.add(node.state)
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
     
     def empty(self):
         return len(self.frontier) == 0
@@ -23,188 +63,1235 @@ class StackFrontier():
         if self.empty():
             raise Exception("empty frontier")
         else: 
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.frontier.pop()
+            self.states.discard(node.state)
             return node
         
 class QueueFrontier(StackFrontier):
+    """First-in first-out frontier with the same interface as StackFrontier."""
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1]
+            node = self.frontier.popleft()
+            self.states.discard(node.state)
             return node
+
+class PriorityFrontier():
+    """Min-heap frontier ordered by priority(node). Adding a state that is
+    already queued only takes effect if the new priority is lower; the stale
+    heap entry is then skipped when it surfaces."""
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.heap = []
+        self.best = {}
+        self.counter = itertools.count()
+
+    def add(self, node):
+        priority = self.priority(node)
+        if node.state not in self.best or priority < self.best[node.state]:
+            self.best[node.state] = priority
+            heapq.heappush(self.heap, (priority, next(self.counter), node))
+
+    def contains_state(self, state):
+        return state in self.best
+
+    def empty(self):
+        return len(self.best) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        while True:
+            priority, _, node = heapq.heappop(self.heap)
+            if self.best.get(node.state) == priority:
+                del self.best[node.state]
+                return node
+
+class BucketQueue():
+    """Monotone priority queue for small integer priorities (Dial's
+    algorithm). Items wait in a ring of max_step + 1 buckets indexed by
+    priority, so push and pop are O(1) instead of a heap's O(log n). It only
+    works if priorities never go below the last one popped and are pushed
+    at most max_step above it, as in Dijkstra's search with step costs of
+    at most max_step."""
+
+    def __init__(self, max_step=MAX_STEP_COST):
+        self.buckets = [[] for _ in range(max_step + 1)]
+        self.current = 0
+        self.size = 0
+
+    def push(self, priority, item):
+        self.buckets[priority % len(self.buckets)].append(item)
+        self.size += 1
+
+    def pop(self):
+        """Remove and return (priority, item) with the lowest priority."""
+        if not self.size:
+            raise Exception("empty frontier")
+        buckets = self.buckets
+        while not buckets[self.current % len(buckets)]:
+            self.current += 1
+        self.size -= 1
+        return self.current, buckets[self.current % len(buckets)].pop()
+
+    def __len__(self):
+        return self.size
+
+class CellSet():
+    """A set of maze cells kept as a bitmap over flat cell ids, one bit per
+    cell. It supports add, in, len and iteration over (row, col) states like
+    the set of tuples it stands in for."""
+
+    def __init__(self, height, width):
+        self.width = width
+        self.size = height * width
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add_cell(self, cell):
+        byte, bit = cell >> 3, 1 << (cell & 7)
+        if not self.bits[byte] & bit:
+            self.bits[byte] |= bit
+            self.count += 1
+
+    def has_cell(self, cell):
+        return bool(self.bits[cell >> 3] & (1 << (cell & 7)))
+
+    def add(self, state):
+        self.add_cell(state[0] * self.width + state[1])
+
+    def __contains__(self, state):
+        row, col = state
+        return 0 <= col < self.width and 0 <= row * self.width + col < self.size \
+            and self.has_cell(row * self.width + col)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index, byte in enumerate(self.bits):
+            if byte:
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield divmod(index * 8 + bit, self.width)
+
+    def mask(self):
+        """Return the set as a flat NumPy bool array over all cells."""
+        import numpy as np
+        bits = np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8), bitorder="little")
+        return bits[:self.size].astype(bool)
+
+class Reachability():
+    """Connected-component labels for the open cells of a maze, so whether
+    one cell can reach another is answered with two array reads.
+
+    Labels are built by numbering the horizontal runs of open cells and
+    merging runs that touch vertically, with vectorized hooking and pointer
+    jumping. Opening a cell afterwards is handled in place by a small
+    union-find over the labels; closing one can split a component, so
+    Maze.set_wall drops the index instead. The labels are int8, int16 or
+    int32, whichever is the narrowest to hold every component, so a maze
+    with few components costs one byte per cell."""
+
+    def __init__(self, maze):
+        import numpy as np
+
+        width = maze.width
+        walls = np.frombuffer(maze.walls, dtype=np.bool_)
+        is_open = ~walls
+
+        # Number the horizontal runs of open cells
+        starts = is_open.copy()
+        starts[1:] &= walls[:-1]
+        starts[::width] = is_open[::width]
+        runs = np.cumsum(starts, dtype=np.int32)
+        runs -= 1
+        count = int(runs[-1]) + 1 if runs.size else 0
+        del starts
+
+        # Merge runs joined by vertically adjacent open cells. The run
+        # numbers are taken through a mask, so no int64 cell indices are made
+        vertical = is_open[:-width] & is_open[width:]
+        del is_open
+        upper, lower = runs[:-width][vertical], runs[width:][vertical]
+        del vertical
+        parent = np.arange(count, dtype=np.int32)
+        while True:
+            a, b = parent[upper], parent[lower]
+            differ = a != b
+            if not differ.any():
+                break
+            np.minimum.at(parent, np.maximum(a, b)[differ], np.minimum(a, b)[differ])
+            while True:
+                grandparent = parent[parent]
+                if (grandparent == parent).all():
+                    break
+                parent = grandparent
+        del upper, lower, a, b, differ
+
+        # Labels take the narrowest type that holds every component
+        roots, component = np.unique(parent, return_inverse=True)
+        dtype = next(t for t in (np.int8, np.int16, np.int32) if len(roots) < np.iinfo(t).max)
+        if count:
+            self.labels = component.astype(dtype)[runs]
+            self.labels[walls] = -1
+        else:
+            self.labels = np.full(walls.size, -1, dtype=dtype)
+        self.parent = list(range(len(roots)))
+        self.width = width
+
+    def find(self, label):
+        parent = self.parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def component(self, state):
+        """Return the component of state, or None for a wall."""
+        label = int(self.labels[state[0] * self.width + state[1]])
+        return None if label < 0 else self.find(label)
+
+    def connected(self, a, b):
+        component = self.component(a)
+        return bool(component is not None and component == self.component(b))
+
+    def open_cell(self, cell, neighbors):
+        """Label a newly opened cell, merging the components of its open
+        neighbors."""
+        import numpy as np
+
+        labels = [self.find(int(self.labels[n])) for n in neighbors]
+        if labels:
+            label = min(labels)
+            for other in labels:
+                self.parent[other] = label
+        else:
+            label = len(self.parent)
+            self.parent.append(label)
+            if label > np.iinfo(self.labels.dtype).max:
+                self.labels = self.labels.astype(np.int32)
+        self.labels[cell] = label
+
+class SolveStats():
+    """Counters and phase timers filled in by Maze.solve(stats=...).
+
+    expanded counts states taken off the frontier, generated the states
+    added to it, and duplicates the open neighbors that were rejected
+    because they had already been reached. frontier_max is the largest the
+    frontier got. phases holds the seconds spent in each phase of the
+    solve. Solvers only touch a SolveStats once per expansion, and not at
+    all when none is passed."""
+
+    def __init__(self):
+        self.strategy = None
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.frontier_max = 0
+        self.phases = {}
+        self.mark = None
+
+    def begin(self, strategy):
+        self.strategy = strategy
+        self.mark = time.perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the last lap to phase."""
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0) + now - self.mark
+        self.mark = now
+
+    def record(self, neighbors, generated, frontier_size):
+        """Account for one expansion that saw neighbors open cells, of which
+        generated were new, leaving frontier_size states on the frontier."""
+        self.generated += generated
+        self.duplicates += neighbors - generated
+        if frontier_size > self.frontier_max:
+            self.frontier_max = frontier_size
+
+    def as_dict(self):
+        return {
+            "strategy": self.strategy,
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "frontier_max": self.frontier_max,
+            "phases": dict(self.phases),
+            "seconds": sum(self.phases.values()),
+        }
+
+    def to_json(self):
+        return json.dumps(self.as_dict())
+
+def astar(start, goal, successors, heuristic, rebuild, explored=None, on_expand=None, stats=None,
+          state=None):
+    """A* from start to goal over a graph other than the maze's own cells,
+    such as jump points, junctions or abstract nodes.
+
+    successors(node, via) yields (neighbor, step cost, via) for the edges
+    out of node. via is anything the caller needs to remember about an edge:
+    it is stored as parents[neighbor] = (node, via), and the via a node was
+    reached by is passed back when it is expanded (None for start).
+    heuristic(node) must be consistent. Returns rebuild(parents) once goal
+    is expanded. Expanded nodes, mapped through state if it is given, are
+    added to explored and passed to on_expand; stats is a SolveStats.
+    Raises Exception if goal cannot be reached."""
+
+    counter = itertools.count()
+    costs = {start: 0}
+    parents = {start: None}
+    frontier = [(heuristic(start), next(counter), start, None)]
+    closed = set()
+    if stats is not None:
+        stats.lap("setup")
+
+    while frontier:
+        _, _, node, via = heapq.heappop(frontier)
+        if node in closed:
+            continue
+        closed.add(node)
+        if explored is not None or on_expand is not None:
+            expanded = node if state is None else state(node)
+            if explored is not None:
+                explored.add(expanded)
+            if on_expand is not None:
+                on_expand(expanded)
+
+        if node == goal:
+            if stats is not None:
+                stats.lap("search")
+            solution = rebuild(parents)
+            if stats is not None:
+                stats.lap("reconstruct")
+            return solution
+
+        found = generated = 0
+        for neighbor, cost, edge in successors(node, via):
+            found += 1
+            cost += costs[node]
+            if neighbor not in closed and cost < costs.get(neighbor, cost + 1):
+                generated += 1
+                costs[neighbor] = cost
+                parents[neighbor] = (node, edge)
+                heapq.heappush(frontier, (cost + heuristic(neighbor), next(counter), neighbor, edge))
+        if stats is not None:
+            stats.record(found, generated, len(frontier))
+
+    if stats is not None:
+        stats.lap("search")
+    raise Exception("no solution")
+
+STRATEGIES = ("dfs", "bfs", "astar", "bidirectional", "jps", "corridors", "hpa", "dijkstra")
+
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+# Actions in the order Maze.neighbors generates them. The compact solver
+# records how it reached each cell as 1 + an index into MOVES.
+MOVES = ("up", "down", "left", "right")
+
+# Cell classes used for rendering, in the order they win when cells are
+# merged to downsample an image; PALETTE gives the color of each.
+EMPTY, WALL, EXPLORED, SOLUTION, GOAL, START = range(6)
+PALETTE = (
+    (237, 240, 252),
+    (40, 40, 40),
+    (212, 97, 85),
+    (220, 235, 133),
+    (0, 171, 28),
+    (255, 0, 0),
+)
+
+# Characters for open cells and walls when printing, as a str.translate table
+CELL_CHARS = {0: " ", 1: "█"}
+
+# Largest image output_image writes in one piece (~200 MB as RGB)
+MAX_IMAGE_PIXELS = 1 << 26
+
+# Distance of a cell solve_dijkstra has not reached, as an array("I") item
+UNREACHED = 0xFFFFFFFF
         
+def iter_lines(data):
+    """Yield the lines of a bytes-like object without splitting it up front."""
+    pos, end = 0, len(data)
+    while pos < end:
+        newline = data.find(b"\n", pos)
+        if newline == -1:
+            newline = end
+        line = data[pos:newline]
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        yield line
+        pos = newline + 1
+
+def terrain_tables(terrain):
+    """Return (walls, costs) bytes.translate tables for a terrain mapping
+    characters to step costs. Characters in terrain are open, the start and
+    goal are open with cost 1, and everything else is a wall."""
+    costs = bytearray(256)
+    for char, cost in terrain.items():
+        if not 1 <= cost <= MAX_STEP_COST:
+            raise ValueError("step costs must be between 1 and {}".format(MAX_STEP_COST))
+        costs[ord(char)] = cost
+    costs[ord("A")] = costs[ord("B")] = 1
+    return bytes(0 if cost else 1 for cost in costs), bytes(costs)
+
 class Maze():
-    def __init__(self, filename):
+    def __init__(self, filename, terrain=None):
+        """Load a maze from a text file or from a binary cache written by save().
+
+        The file is memory-mapped rather than read, and a text maze is parsed
+        from the map in two passes: one that sizes the grid and checks the
+        start and goal as it goes, and one that fills the wall bytes.
+
+        terrain makes a text maze weighted: it maps characters to the cost
+        of stepping onto them (e.g. DIGIT_TERRAIN) and the step costs are
+        kept in self.costs, one byte per cell. Otherwise self.costs is None
+        and every open cell costs 1. Only "dijkstra" uses the costs; the
+        other strategies treat all open cells alike."""
+
+        with open(filename, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            except ValueError:
+                # Empty files cannot be mapped
+                data = b""
+
+        if data[:len(CACHE_MAGIC)] in (CACHE_MAGIC, WEIGHTED_MAGIC):
+            self._load_cache(data)
+        else:
+            self._load_text(data, terrain)
 
-        with open(filename) as f:
-            contents = f.read()
+        self.solution = None
+        self.reachability = None
+        self.corridor_graph = None
+        self.hierarchy = None
+
+    def _load_text(self, data, terrain=None):
+        self.start = self.goal = None
+        height = width = 0
+        for i, line in enumerate(iter_lines(data)):
+            height += 1
+            width = max(width, len(line))
+            if b"A" in line:
+                if self.start is not None or line.count(b"A") > 1:
+                    raise Exception ("maze must have exactly one start point")
+                self.start = (i, line.index(b"A"))
+            if b"B" in line:
+                if self.goal is not None or line.count(b"B") > 1:
+                    raise Exception("maze must have excatly one goal")
+                self.goal = (i, line.index(b"B"))
 
-        if contents.count("A") != 1:
+        if self.start is None:
             raise Exception ("maze must have exactly one start point")
-        if contents.count("B") != 1:
+        if self.goal is None:
             raise Exception("maze must have excatly one goal")
-        
-        contents = contents.splitlines()
-        self.height = len (contents)
-        self.width = max(len(line) for line in contents)
-
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try: 
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i,j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
 
-        self.solution = None
-    
-    def print(self):
-        solution = self.solution[1] if self.solution is not None else None
-        print()
-
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col: 
-                    print("█", end="")
-                elif (i,j) == self.start:
-                    print ("A", end = "")
-                elif (i,j) == self.goal:
-                    print("B", end = "")
-                elif solution is not None and (i, j) in solution:
-                    print ("*", end = "")
-                else: 
-                    print(" ", end = "")
-            print()
-        print()
+        self.height = height
+        self.width = width
+
+        # Walls are kept in one flat, row-major bytearray (one byte per cell)
+        # rather than a list of lists, so cell (i, j) lives at i * width + j.
+        # Short lines are padded with open cells.
+        self.walls = bytearray(height * width)
+        if terrain is None:
+            self.costs = None
+            for i, line in enumerate(iter_lines(data)):
+                base = i * width
+                self.walls[base:base + len(line)] = line.translate(WALL_TABLE)
+            return
+
+        wall_table, cost_table = terrain_tables(terrain)
+        self.costs = bytearray(b"\x01") * (height * width)
+        for i, line in enumerate(iter_lines(data)):
+            base = i * width
+            self.walls[base:base + len(line)] = line.translate(wall_table)
+            self.costs[base:base + len(line)] = line.translate(cost_table)
+
+    def _load_cache(self, data):
+        (magic, self.height, self.width,
+         start_row, start_col, goal_row, goal_col) = CACHE_HEADER.unpack_from(data)
+        self.start = (start_row, start_col)
+        self.goal = (goal_row, goal_col)
+
+        size = self.height * self.width
+        layers = 2 if magic == WEIGHTED_MAGIC else 1
+        if len(data) - CACHE_HEADER.size != layers * size:
+            raise Exception("maze cache is truncated or corrupt")
+
+        # Views onto the copy-on-write map: nothing is copied up front and
+        # writes to the walls never reach the file.
+        view = memoryview(data)[CACHE_HEADER.size:]
+        self.walls = view[:size]
+        self.costs = view[size:] if layers == 2 else None
+
+    def save(self, filename):
+        """Write the maze in the binary cache format read back by Maze().
+
+        The cache is written to a temporary file beside filename and moved
+        over it, since the walls of a maze loaded from a cache are views
+        onto that file's map: truncating it first would lose them."""
+        fd, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                magic = CACHE_MAGIC if self.costs is None else WEIGHTED_MAGIC
+                f.write(CACHE_HEADER.pack(magic, self.height, self.width,
+                                          *self.start, *self.goal))
+                f.write(self.walls)
+                if self.costs is not None:
+                    f.write(self.costs)
+            # mkstemp makes the file private; give it the mode open() would
+            if os.path.exists(filename):
+                shutil.copymode(filename, temporary)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(temporary, 0o666 & ~umask)
+            os.replace(temporary, filename)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def cell_id(self, state):
+        """Return the flat, row-major index of the cell at (row, col)."""
+        row, col = state
+        return row * self.width + col
+
+    def cell_state(self, cell):
+        """Return the (row, col) of the cell with the given flat index."""
+        return divmod(cell, self.width)
+
+    def is_wall(self, state):
+        row, col = state
+        return self.walls[row * self.width + col] == 1
+
+    def index_reachability(self):
+        """Build (or return the existing) Reachability index. While it
+        exists, solve() rejects unreachable goals without searching."""
+        if self.reachability is None:
+            self.reachability = Reachability(self)
+        return self.reachability
+
+    def connected(self, a=None, b=None):
+        """Return whether b (the goal by default) can be reached from a (the
+        start by default), building the reachability index if needed."""
+        return self.index_reachability().connected(
+            a if a is not None else self.start,
+            b if b is not None else self.goal)
+
+    def set_wall(self, state, wall=True):
+        """Open or close the cell at state, keeping the reachability index
+        valid: opening updates it in place, closing drops it. Any cached
+        corridor graph or hierarchy is dropped. A wall opened in a weighted
+        maze costs 1 to cross."""
+        cell = self.cell_id(state)
+        if bool(self.walls[cell]) == wall:
+            return
+        self.walls[cell] = 1 if wall else 0
+        if not wall and self.costs is not None and not self.costs[cell]:
+            self.costs[cell] = 1
+        self.corridor_graph = None
+        self.hierarchy = None
+        if self.reachability is None:
+            return
+        if wall:
+            self.reachability = None
+        else:
+            self.reachability.open_cell(
+                cell, [self.cell_id(s) for _, s in self.neighbors(state)])
+
+    def clip(self, viewport=None):
+        """Clamp a (top, left, height, width) viewport to the grid; None
+        means the whole maze."""
+        if viewport is None:
+            return (0, 0, self.height, self.width)
+        top, left, height, width = viewport
+        top = min(max(top, 0), self.height)
+        left = min(max(left, 0), self.width)
+        return (top, left, min(height, self.height - top), min(width, self.width - left))
+
+    def terminal_viewport(self, center=None):
+        """Return the viewport that fits the terminal, centered on center
+        (the start by default) as far as the maze edges allow."""
+        columns, lines = shutil.get_terminal_size()
+        height = min(self.height, max(lines - 3, 1))
+        width = min(self.width, columns)
+        row, col = center if center is not None else self.start
+        top = min(max(row - height // 2, 0), self.height - height)
+        left = min(max(col - width // 2, 0), self.width - width)
+        return (top, left, height, width)
+
+    def render(self, viewport=None):
+        """Return the maze (or the part of it inside viewport) as one string,
+        with the solution marked if there is one."""
+        top, left, height, width = self.clip(viewport)
+
+        marks = {}
+        if self.solution is not None:
+            for row, col in self.solution[1]:
+                marks.setdefault(row, []).append((col, "*"))
+        for (row, col), char in ((self.goal, "B"), (self.start, "A")):
+            marks.setdefault(row, []).append((col, char))
+
+        lines = []
+        for i in range(top, top + height):
+            base = i * self.width + left
+            line = bytes(self.walls[base:base + width]).decode("latin-1").translate(CELL_CHARS)
+            if i in marks:
+                chars = list(line)
+                for j, char in marks[i]:
+                    if left <= j < left + width:
+                        chars[j - left] = char
+                line = "".join(chars)
+            lines.append(line)
+        return "\n".join(lines)
+
+    def print(self, viewport=None):
+        """Print the maze, or only the cells inside a (top, left, height,
+        width) viewport, in a single write."""
+        sys.stdout.write("\n" + self.render(viewport) + "\n\n")
     
     def neighbors(self, state):
         row, col = state 
-        candidates = [
-            ("up", (row -1, col)),
-            ("down", (row +1, col)),
-            ("left", (row , col -1)),
-            ("right", (row, col +1)),
-        ]
+        width = self.width
+        walls = self.walls
+        cell = row * width + col
 
         result = []
-        for action, (r, c) in candidates: 
-            if 0 <= r < self.height and 0 <= c <self.width and not self.walls[r][c]:
-                result.append((action, (r,c)))
-            return result
+        if row > 0 and not walls[cell - width]:
+            result.append(("up", (row - 1, col)))
+        if row < self.height - 1 and not walls[cell + width]:
+            result.append(("down", (row + 1, col)))
+        if col > 0 and not walls[cell - 1]:
+            result.append(("left", (row, col - 1)))
+        if col < width - 1 and not walls[cell + 1]:
+            result.append(("right", (row, col + 1)))
+        return result
         
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+    def solve(self, strategy="dfs", on_expand=None, stats=None):
+        """Finds a solution to maze, if one exists.
+
+        strategy picks the search: "dfs" (depth-first, the default), "bfs"
+        (breadth-first), "astar" (A* with a Manhattan distance heuristic) or
+        "bidirectional" (breadth-first from both ends, meeting in the middle),
+        "jps" (Jump Point Search, see jps.py), "corridors" (A* over junctions
+        after dead-end filling, see corridors.py), "hpa" (hierarchical A*
+        over clusters, see hpa.py) or "dijkstra" (cheapest path by the step
+        costs of a weighted maze). All but "dfs" and "hpa" find a shortest
+        path; "hpa" finds a near-shortest one. Only "dijkstra" takes step
+        costs into account.
+
+        If on_expand is given it is called with each state as it is expanded,
+        e.g. LiveView.expand to animate the search. If stats is a SolveStats
+        it is filled in with counters and phase timings. If the maze has a
+        reachability index, an unreachable goal fails without searching."""
+
+        if strategy not in STRATEGIES:
+            raise ValueError("unknown search strategy: {}".format(strategy))
+
+        if stats is not None:
+            stats.begin(strategy)
+        try:
+            if self.reachability is not None and not self.reachability.connected(self.start, self.goal):
+                self.num_explored = 0
+                self.explored = set()
+                raise Exception("no solution")
+
+            if strategy == "bidirectional":
+                return self.solve_bidirectional(on_expand, stats)
+            if strategy == "astar":
+                return self.solve_astar(on_expand, stats)
+            if strategy == "jps":
+                return self.solve_jps(on_expand, stats)
+            if strategy == "corridors":
+                return self.solve_corridors(on_expand, stats)
+            if strategy == "hpa":
+                return self.solve_hpa(on_expand, stats)
+            if strategy == "dijkstra":
+                return self.solve_dijkstra(on_expand, stats)
+
+            return self.solve_compact(strategy, on_expand, stats)
+        finally:
+            if stats is not None:
+                stats.expanded = self.num_explored
+
+    def solve_compact(self, strategy="dfs", on_expand=None, stats=None):
+        """Depth- or breadth-first search over flat cell ids, with no Node
+        objects. How each cell was reached is kept as one byte per cell in
+        a moves array, which also marks the cell as seen, and its parent is
+        recovered from that move when tracing the path back. explored is a
+        CellSet bitmap. Expands the same states in the same order as the
+        Node-based search with StackFrontier or QueueFrontier would."""
+
+        width = self.width
+        walls = self.walls
+        last_row = self.height - 1
+        start = self.cell_id(self.start)
+        goal = self.cell_id(self.goal)
+
+        moves = bytearray(self.height * width)
+        moves[start] = len(MOVES) + 1
+        self.num_explored = 0
+        self.explored = explored = CellSet(self.height, width)
+
+        if strategy == "dfs":
+            frontier = array.array("q", [start])
+            remove = frontier.pop
+        else:
+            frontier = deque([start])
+            remove = frontier.popleft
+        add = frontier.append
+        if stats is not None:
+            stats.lap("setup")
+
+        while frontier:
+            cell = remove()
+            self.num_explored += 1
+            if on_expand is not None:
+                on_expand(divmod(cell, width))
+
+            if cell == goal:
+                if stats is not None:
+                    stats.lap("search")
+                self.solution = self.trace(moves, cell)
+                if stats is not None:
+                    stats.lap("reconstruct")
+                return
+
+            explored.add_cell(cell)
+            size = len(frontier)
+
+            # Open neighbors are counted in the same checks, for stats
+            row, col = divmod(cell, width)
+            neighbors = 0
+            if row > 0 and not walls[cell - width]:
+                neighbors += 1
+                if not moves[cell - width]:
+                    moves[cell - width] = 1
+                    add(cell - width)
+            if row < last_row and not walls[cell + width]:
+                neighbors += 1
+                if not moves[cell + width]:
+                    moves[cell + width] = 2
+                    add(cell + width)
+            if col > 0 and not walls[cell - 1]:
+                neighbors += 1
+                if not moves[cell - 1]:
+                    moves[cell - 1] = 3
+                    add(cell - 1)
+            if col < width - 1 and not walls[cell + 1]:
+                neighbors += 1
+                if not moves[cell + 1]:
+                    moves[cell + 1] = 4
+                    add(cell + 1)
+            if stats is not None:
+                stats.record(neighbors, len(frontier) - size, len(frontier))
+
+        if stats is not None:
+            stats.lap("search")
+        raise Exception("no solution")
 
-        self.num_explored = 0 
+    def trace(self, moves, cell):
+        """Return the (actions, cells) solution that reaches cell, following
+        a moves array from solve_compact back to the start."""
+        width = self.width
+        offsets = (-width, width, -1, 1)
+        start = self.cell_id(self.start)
+        actions = []
+        cells = []
+        while cell != start:
+            move = moves[cell] - 1
+            actions.append(MOVES[move])
+            cells.append(divmod(cell, width))
+            cell -= offsets[move]
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
 
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
-        frontier.add(start)
+    def backtrack(self, node):
+        """Return the (actions, cells) solution that leads to node."""
+        actions = []
+        cells = []
+        while node.parent is not None:
+            actions.append(node.action)
+            cells.append(node.state)
+            node = node.parent
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
 
+    def path_cost(self, cells=None):
+        """Total step cost of a path given as its cells after the start (the
+        current solution by default): its length unless the maze is
+        weighted."""
+        if cells is None:
+            cells = self.solution[1]
+        if self.costs is None:
+            return len(cells)
+        return sum(self.costs[self.cell_id(state)] for state in cells)
+
+    def manhattan(self, state):
+        """Manhattan distance from state to the goal."""
+        return abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
+
+    def solve_astar(self, on_expand=None, stats=None):
+        """A* search with a Manhattan distance heuristic. Ties on f are broken
+        towards lower h, i.e. towards nodes closer to the goal."""
+
+        self.num_explored = 0
         self.explored = set()
 
+        def priority(node):
+            h = self.manhattan(node.state)
+            return (node.cost + h, h)
+
+        frontier = PriorityFrontier(priority)
+        frontier.add(Node(state=self.start, parent=None, action=None))
+        if stats is not None:
+            stats.lap("setup")
+
         while True:
             if frontier.empty():
+                if stats is not None:
+                    stats.lap("search")
                 raise Exception("no solution")
-            
+
             node = frontier.remove()
             self.num_explored += 1
+            if on_expand is not None:
+                on_expand(node.state)
 
             if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
-                return 
-            
+                if stats is not None:
+                    stats.lap("search")
+                self.solution = self.backtrack(node)
+                if stats is not None:
+                    stats.lap("reconstruct")
+                return
+
             self.explored.add(node.state)
 
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored: 
+            neighbors = self.neighbors(node.state)
+            pushed = len(frontier.heap)
+            for action, state in neighbors:
+                if state not in self.explored:
+                    frontier.add(Node(state=state, parent=node, action=action,
+                                      cost=node.cost + 1))
+            if stats is not None:
+                stats.record(len(neighbors), len(frontier.heap) - pushed, len(frontier.best))
+
+    def solve_jps(self, on_expand=None, stats=None):
+        """Jump Point Search. num_explored and explored count only the jump
+        points expanded, not the cells skipped over between them."""
+        from jps import jump_point_search
+
+        self.explored = set()
+        try:
+            self.solution = jump_point_search(self, self.explored, on_expand, stats)
+        finally:
+            self.num_explored = len(self.explored)
+
+    def solve_corridors(self, on_expand=None, stats=None):
+        """A* over a CorridorGraph, which is built on first use and kept
+        until the walls, start or goal change. num_explored and explored
+        count only the junctions expanded."""
+        from corridors import CorridorGraph
+
+        graph = self.corridor_graph
+        if (graph is None or graph.start != self.cell_id(self.start)
+                or graph.goal != self.cell_id(self.goal)):
+            graph = self.corridor_graph = CorridorGraph(self)
+
+        self.explored = set()
+        try:
+            self.solution = graph.search(self.explored, on_expand, stats)
+        finally:
+            self.num_explored = len(self.explored)
+
+    def solve_hpa(self, on_expand=None, stats=None):
+        """Hierarchical A* over self.hierarchy, a HierarchicalGraph that is
+        built with the default cluster size on first use (or can be set from
+        HierarchicalGraph.load) and kept until the walls change. num_explored
+        and explored count only the abstract nodes expanded."""
+        from hpa import HierarchicalGraph
+
+        if self.hierarchy is None:
+            self.hierarchy = HierarchicalGraph(self)
+
+        self.explored = set()
+        try:
+            self.solution = self.hierarchy.search(self.explored, on_expand, stats)
+        finally:
+            self.num_explored = len(self.explored)
+
+    def solve_dijkstra(self, on_expand=None, stats=None):
+        """Dijkstra's search over flat cell ids for the cheapest path, where
+        stepping onto a cell costs its entry in self.costs (1 everywhere if
+        the maze is not weighted). Step costs are small integers, so the
+        frontier is a BucketQueue: pushes and pops are O(1) and the search
+        runs at close to breadth-first speed. Entries left behind when a
+        cell is reached more cheaply are skipped as they come up. As in
+        solve_compact, moves records how each cell was best reached."""
+
+        width = self.width
+        walls = self.walls
+        costs = self.costs
+        last_row = self.height - 1
+        start = self.cell_id(self.start)
+        goal = self.cell_id(self.goal)
+
+        size = self.height * width
+        distances = array.array("I", [UNREACHED]) * size
+        distances[start] = 0
+        moves = bytearray(size)
+        moves[start] = len(MOVES) + 1
+        self.num_explored = 0
+        self.explored = explored = CellSet(self.height, width)
+
+        frontier = BucketQueue()
+        frontier.push(0, start)
+        if stats is not None:
+            stats.lap("setup")
+
+        while frontier:
+            distance, cell = frontier.pop()
+            if distance != distances[cell]:
+                continue
+            self.num_explored += 1
+            if on_expand is not None:
+                on_expand(divmod(cell, width))
+
+            if cell == goal:
+                if stats is not None:
+                    stats.lap("search")
+                self.solution = self.trace(moves, cell)
+                if stats is not None:
+                    stats.lap("reconstruct")
+                return
+
+            explored.add_cell(cell)
+
+            row, col = divmod(cell, width)
+            neighbors = generated = 0
+            for move, neighbor, inside in ((1, cell - width, row > 0),
+                                           (2, cell + width, row < last_row),
+                                           (3, cell - 1, col > 0),
+                                           (4, cell + 1, col < width - 1)):
+                if not inside or walls[neighbor]:
+                    continue
+                neighbors += 1
+                cost = distance + (1 if costs is None else costs[neighbor])
+                if cost < distances[neighbor]:
+                    distances[neighbor] = cost
+                    moves[neighbor] = move
+                    frontier.push(cost, neighbor)
+                    generated += 1
+            if stats is not None:
+                stats.record(neighbors, generated, len(frontier))
+
+        if stats is not None:
+            stats.lap("search")
+        raise Exception("no solution")
+
+    def solve_bidirectional(self, on_expand=None, stats=None):
+        """Breadth-first search from the start and the goal at once, always
+        expanding a whole layer of the smaller side. The first state that one
+        side generates and the other has already reached joins a shortest
+        path, since neither side has found the other in an earlier layer."""
+
+        self.num_explored = 0
+        self.explored = set()
+
+        forward = {self.start: Node(state=self.start, parent=None, action=None)}
+        backward = {self.goal: Node(state=self.goal, parent=None, action=None)}
+        forward_layer = [forward[self.start]]
+        backward_layer = [backward[self.goal]]
+        if stats is not None:
+            stats.lap("setup")
+
+        while forward_layer and backward_layer:
+            is_forward = len(forward_layer) <= len(backward_layer)
+            if is_forward:
+                layer, seen, other = forward_layer, forward, backward
+            else:
+                layer, seen, other = backward_layer, backward, forward
+            waiting = len(forward_layer) + len(backward_layer)
+
+            next_layer = []
+            for node in layer:
+                self.num_explored += 1
+                self.explored.add(node.state)
+                if on_expand is not None:
+                    on_expand(node.state)
+                neighbors = self.neighbors(node.state)
+                generated = len(next_layer)
+                for action, state in neighbors:
+                    if state in seen:
+                        continue
+                    if state in other:
+                        if stats is not None:
+                            stats.lap("search")
+                        if is_forward:
+                            self.solution = self.join(node, action, other[state])
+                        else:
+                            self.solution = self.join(other[state], OPPOSITE[action], node)
+                        if stats is not None:
+                            stats.lap("reconstruct")
+                        return
                     child = Node(state=state, parent=node, action=action)
-                    frontier.add(child)
+                    seen[state] = child
+                    next_layer.append(child)
+                if stats is not None:
+                    waiting -= 1
+                    stats.record(len(neighbors), len(next_layer) - generated,
+                                 waiting + len(next_layer))
+
+            if is_forward:
+                forward_layer = next_layer
+            else:
+                backward_layer = next_layer
+
+        if stats is not None:
+            stats.lap("search")
+        raise Exception("no solution")
+
+    def join(self, forward_node, action, backward_node):
+        """Return the solution that follows the forward search tree to
+        forward_node, takes action, then follows the backward search tree
+        from backward_node to the goal."""
+        actions, cells = self.backtrack(forward_node)
+        actions.append(action)
+        cells.append(backward_node.state)
+        node = backward_node
+        while node.parent is not None:
+            actions.append(OPPOSITE[node.action])
+            cells.append(node.parent.state)
+            node = node.parent
+        return (actions, cells)
+
+    def distance_field(self, sources=None):
+        """Return the breadth-first distance from the nearest of sources (the
+        start by default) to every cell, as a height x width NumPy array with
+        -1 for walls and unreachable cells.
+
+        The search advances a whole wavefront per step with array operations,
+        so one call answers reachability (distances[row, col] >= 0) and path
+        length for every cell at once; see descend() for the paths."""
+        import numpy as np
+
+        size = self.height * self.width
+        width = self.width
+        is_open = np.frombuffer(self.walls, dtype=np.uint8) == 0
+        distances = np.full(size, -1, dtype=np.int32)
+
+        if sources is None:
+            sources = [self.start]
+        frontier = np.unique(np.array([self.cell_id(s) for s in sources], dtype=np.int64))
+        frontier = frontier[is_open[frontier]]
+        distances[frontier] = 0
+
+        distance = 0
+        while frontier.size:
+            distance += 1
+            col = frontier % width
+            candidates = np.concatenate((
+                frontier - width,
+                frontier + width,
+                frontier[col > 0] - 1,
+                frontier[col < width - 1] + 1,
+            ))
+            candidates = candidates[(candidates >= 0) & (candidates < size)]
+            candidates = candidates[is_open[candidates] & (distances[candidates] < 0)]
+            frontier = np.unique(candidates)
+            distances[frontier] = distance
+
+        return distances.reshape(self.height, self.width)
+
+    def descend(self, distances, state):
+        """Return the (actions, cells) path from the nearest source of a
+        distance_field() to state, found by stepping downhill one cell at a
+        time."""
+        row, col = state
+        if distances[row, col] < 0:
+            raise Exception("no solution")
+
+        actions = []
+        cells = []
+        while distances[row, col] > 0:
+            cells.append((row, col))
+            downhill = distances[row, col] - 1
+            for action, (r, c) in self.neighbors((row, col)):
+                if distances[r, c] == downhill:
+                    actions.append(OPPOSITE[action])
+                    row, col = r, c
+                    break
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
     
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
-        cell_size = 50
-        cell_border = 20
-
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                
-                #Walls
-                if col:
-                    fill = (40,40,40)
-
-                #Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-
-                #Goal
-                elif (i,j) == self.goal:
-                    fill = (0,171,28)
-                
-                #Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 133)
-
-                #Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
-
-                #Empty cell
+    def cell_classes(self, show_solution=True, show_explored=False):
+        """Return a height x width uint8 array giving each cell's class for
+        rendering (EMPTY, WALL, EXPLORED, SOLUTION, GOAL or START)."""
+        import numpy as np
+
+        def cell_ids(states):
+            return np.fromiter((self.cell_id(s) for s in states),
+                               dtype=np.int64, count=len(states))
+
+        classes = np.zeros(self.height * self.width, dtype=np.uint8)
+        if self.solution is not None:
+            if show_explored:
+                if isinstance(self.explored, CellSet):
+                    classes[self.explored.mask()] = EXPLORED
                 else:
-                    fill = (237, 240, 252)
-
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-        img.save(filename)
-    
-if len(sys.argv) != 2:
-    sys.exit("Usage: python347 maze.py maze.txt")
-    
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+                    classes[cell_ids(self.explored)] = EXPLORED
+            if show_solution:
+                classes[cell_ids(self.solution[1])] = SOLUTION
+        classes[np.frombuffer(self.walls, dtype=np.uint8) != 0] = WALL
+        classes[self.cell_id(self.goal)] = GOAL
+        classes[self.cell_id(self.start)] = START
+        return classes.reshape(self.height, self.width)
+
+    def output_image(self, filename, show_solution=True, show_explored=False,
+                     cell_size=50, cell_border=20, tile=None):
+        """Render the maze to an image file.
+
+        The image is built as one NumPy RGB array from the cell classes and
+        scaled up by cell_size. If it would exceed MAX_IMAGE_PIXELS, cells are
+        drawn smaller and, failing that, merged into blocks that keep their
+        highest class, so the solution stays visible. With tile=N the full-size
+        image is instead written as tiles of N x N cells, named
+        <name>_<row>_<col><ext>."""
+        from PIL import Image
+        import numpy as np
+
+        classes = self.cell_classes(show_solution, show_explored)
+        palette = np.array(PALETTE, dtype=np.uint8)
+
+        if tile is not None:
+            name, ext = os.path.splitext(filename)
+            for row in range(0, self.height, tile):
+                for col in range(0, self.width, tile):
+                    block = classes[row:row + tile, col:col + tile]
+                    pixels = scale_cells(palette[block], cell_size, cell_border)
+                    Image.fromarray(pixels).save(
+                        "{}_{}_{}{}".format(name, row // tile, col // tile, ext))
+            return
+
+        cells = self.height * self.width
+        if cells * cell_size * cell_size > MAX_IMAGE_PIXELS:
+            fitted = max(1, int((MAX_IMAGE_PIXELS / cells) ** 0.5))
+            cell_border = cell_border * fitted // cell_size
+            cell_size = fitted
+        if cells > MAX_IMAGE_PIXELS:
+            stride = math.ceil((cells / MAX_IMAGE_PIXELS) ** 0.5)
+            classes = merge_cells(classes, stride)
+
+        pixels = scale_cells(palette[classes], cell_size, cell_border)
+        Image.fromarray(pixels).save(filename)
+
+
+def scale_cells(colors, cell_size, cell_border):
+    """Scale a height x width x 3 array of cell colors up to an image where
+    each cell is a cell_size square on black, inset by cell_border."""
+    import numpy as np
+
+    height, width, channels = colors.shape
+    pixels = np.zeros((height, cell_size, width, cell_size, channels), dtype=np.uint8)
+    inset = slice(cell_border, cell_size - cell_border + 1)
+    pixels[:, inset, :, inset] = colors[:, None, :, None]
+    return pixels.reshape(height * cell_size, width * cell_size, channels)
+
+
+def merge_cells(classes, stride):
+    """Downsample a class array by stride, keeping the highest class found
+    in each stride x stride block."""
+    import numpy as np
+
+    height, width = classes.shape
+    padded = np.zeros((-(-height // stride) * stride, -(-width // stride) * stride),
+                      dtype=classes.dtype)
+    padded[:height, :width] = classes
+    blocks = padded.reshape(padded.shape[0] // stride, stride,
+                            padded.shape[1] // stride, stride)
+    return blocks.max(axis=(1, 3))
+
+
+class LiveView():
+    """Animates a search in the terminal. Pass expand as the on_expand hook
+    of Maze.solve: it only queues states, and every interval seconds the
+    queued cells inside the viewport are redrawn with cursor escapes in a
+    single write, so watching costs the search very little."""
+
+    def __init__(self, maze, viewport=None, interval=0.05, stream=None):
+        self.maze = maze
+        self.viewport = maze.clip(viewport if viewport is not None else maze.terminal_viewport())
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.stdout
+        self.pending = []
+        self.last_flush = 0
+
+    def start(self):
+        """Clear the screen and draw the first frame."""
+        self.stream.write("\x1b[2J\x1b[H" + self.maze.render(self.viewport))
+        self.stream.flush()
+        self.last_flush = time.monotonic()
+
+    def expand(self, state):
+        self.pending.append(state)
+        # Only look at the clock every so often; expand runs once per state
+        if len(self.pending) % 256 == 0 and time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def draw(self, states, char):
+        top, left, height, width = self.viewport
+        maze = self.maze
+        out = []
+        for row, col in states:
+            if (top <= row < top + height and left <= col < left + width
+                    and (row, col) != maze.start and (row, col) != maze.goal):
+                out.append("\x1b[{};{}H{}".format(row - top + 1, col - left + 1, char))
+        self.stream.write("".join(out))
+
+    def flush(self):
+        """Redraw the cells expanded since the last flush."""
+        self.draw(self.pending, ".")
+        self.pending = []
+        self.stream.flush()
+        self.last_flush = time.monotonic()
+
+    def finish(self):
+        """Draw the remaining expansions and the solution, then move the
+        cursor below the frame."""
+        self.draw(self.pending, ".")
+        self.pending = []
+        if self.maze.solution is not None:
+            self.draw(self.maze.solution[1], "*")
+        self.stream.write("\x1b[{};1H\n".format(self.viewport[2] + 1))
+        self.stream.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a maze and draw it to maze.png.")
+    parser.add_argument("maze", help="text maze or binary cache")
+    parser.add_argument("strategy", nargs="?", default="dfs", choices=STRATEGIES)
+    parser.add_argument("--terrain", choices=TERRAINS,
+                        help="read a text maze as weighted, e.g. digits for step costs 1-9")
+    args = parser.parse_args()
+
+    m = Maze(args.maze, TERRAINS.get(args.terrain))
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve(args.strategy)
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+    m.output_image("maze.png", show_explored=True)
 
-        
 
-                
\ No newline at end of file
+if __name__ == "__main__":
+    main()